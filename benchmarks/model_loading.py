@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestRegressor
+
+from src.backend.data.dataset import DatasetLoader
+from src.backend.services.model_service import ModelService
+
+
+def read_memory_kb():
+    memory = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                memory["rss"] = int(line.split()[1])
+    if os.path.exists("/proc/self/smaps_rollup"):
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    memory["pss"] = int(line.split()[1])
+    return memory
+
+
+def worker(model_dir, load_mode, hold_seconds):
+    service = ModelService(model_dir=model_dir, load_mode=load_mode)
+    catalog = DatasetLoader().load_data().head(100)
+    before = read_memory_kb()
+    started_at = time.perf_counter()
+    service.load_model()
+    X = service.dataset_loader.transform_frame(catalog)
+    service.model.predict(X)
+    elapsed = time.perf_counter() - started_at
+    time.sleep(hold_seconds)
+    after = read_memory_kb()
+    print(f"{elapsed:.3f} {after['rss'] - before['rss']} {after.get('pss', 0) - before.get('pss', 0)}", flush=True)
+
+
+def publish_forest(model_dir, n_estimators):
+    service = ModelService(model_dir=model_dir)
+    model_info = service.train_model("random_forest", publish=False)
+    model = RandomForestRegressor(random_state=42, n_estimators=n_estimators)
+    X_train, _, y_train, _, _ = model_info["dataset_loader"].prepare_train_test_data()
+    model.fit(X_train, y_train)
+    model_info["model"] = model
+    model_info["uncertainty"].fit(model, X_train, y_train)
+    service.publish_model(model_info)
+
+
+def run_workers(model_dir, load_mode, n_workers):
+    processes = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", "--model-dir", model_dir, "--load-mode", load_mode,
+             "--hold", str(2.0 + 0.1 * n_workers)],
+            stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(n_workers)
+    ]
+    results = []
+    for process in processes:
+        output = process.communicate()[0].strip().splitlines()[-1]
+        elapsed, rss, pss = output.split()
+        results.append((float(elapsed), int(rss), int(pss)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare joblib and memory-mapped model loading")
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--model-dir")
+    parser.add_argument("--load-mode", default="memory")
+    parser.add_argument("--hold", type=float, default=0.0)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.model_dir, args.load_mode, args.hold)
+        return
+
+    model_dir = args.model_dir or tempfile.mkdtemp(prefix="lapimate-bench-")
+    if not ModelService(model_dir=model_dir).registry.get_current():
+        publish_forest(model_dir, args.n_estimators)
+
+    print(f"{'mode':<8}{'workers':>8}{'load s':>10}{'RSS MB':>10}{'PSS MB':>10}")
+    for load_mode in ("memory", "mmap"):
+        results = run_workers(model_dir, load_mode, args.workers)
+        load_time = sum(r[0] for r in results) / len(results)
+        rss = sum(r[1] for r in results) / len(results) / 1024
+        pss = sum(r[2] for r in results) / len(results) / 1024
+        print(f"{load_mode:<8}{args.workers:>8}{load_time:>10.3f}{rss:>10.1f}{pss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
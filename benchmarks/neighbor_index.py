@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backend.data.dataset import DatasetLoader
+from src.backend.domain.models import LaptopSpecification
+from src.backend.services.recommendation_service import RecommendationService
+
+
+def synthetic_catalog(rows: int, seed: int = 42) -> DatasetLoader:
+    dataset_loader = DatasetLoader()
+    df = dataset_loader.load_data()
+
+    rng = np.random.RandomState(seed)
+    catalog = df.iloc[rng.randint(0, len(df), rows)].reset_index(drop=True)
+    catalog['screen_size'] = (catalog['screen_size'] + rng.normal(scale=0.3, size=rows)).astype(np.float32)
+    catalog['weight'] = (catalog['weight'] + rng.normal(scale=0.2, size=rows)).clip(0.5).astype(np.float32)
+
+    dataset_loader.df = catalog
+    return dataset_loader
+
+
+def sample_queries(df, n_queries: int, seed: int = 7):
+    rng = np.random.RandomState(seed)
+    queries = []
+    for i in rng.randint(0, len(df), n_queries):
+        row = df.iloc[i]
+        queries.append(LaptopSpecification(
+            company=row['company'],
+            product=row['product'],
+            type_name=row['type'],
+            screen_size=float(row['screen_size']) + rng.normal(scale=0.5),
+            screen_resolution=row['screen_resolution'],
+            cpu=row['cpu'],
+            ram=int(row['ram']),
+            gpu=row['gpu'],
+            operating_system=row['operating_system'],
+            weight=float(row['weight']) + rng.normal(scale=0.3)
+        ))
+    return queries
+
+
+def run_queries(service, queries, k, **search_kwargs):
+    index = service._index
+    results = []
+    started_at = time.perf_counter()
+    for spec in queries:
+        results.append(index["neighbors"].search(service._query_vector(index, spec), k, **search_kwargs))
+    return results, (time.perf_counter() - started_at) / len(queries) * 1000
+
+
+def recall(results, exact_results):
+    hits = 0
+    total = 0
+    for (_, scores), (_, exact_scores) in zip(results, exact_results):
+        hits += np.sum(scores >= exact_scores[-1] - 1e-6)
+        total += len(exact_scores)
+    return hits / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare recommendation neighbour index backends")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    dataset_loader = synthetic_catalog(args.rows)
+    queries = sample_queries(dataset_loader.df, args.queries)
+
+    print(f"{'backend':<24}{'build s':>10}{'query ms':>10}{'recall':>8}{'load s':>8}")
+    exact_results = None
+    for backend in ("exact", "ball_tree", "ivf"):
+        started_at = time.perf_counter()
+        service = RecommendationService(dataset_loader, index_backend=backend)
+        build_seconds = time.perf_counter() - started_at
+
+        with tempfile.TemporaryDirectory() as directory:
+            service.save_index(directory)
+            started_at = time.perf_counter()
+            RecommendationService(dataset_loader, index_backend=backend, index_dir=directory)
+            load_seconds = time.perf_counter() - started_at
+
+        probes = args.n_probe if backend == "ivf" else [None]
+        for n_probe in probes:
+            search_kwargs = {"n_probe": n_probe} if n_probe else {}
+            results, query_ms = run_queries(service, queries, args.k, **search_kwargs)
+            if exact_results is None:
+                exact_results = results
+
+            label = f"{backend} (n_probe={n_probe})" if n_probe else backend
+            print(f"{label:<24}{build_seconds:>10.2f}{query_ms:>10.3f}"
+                  f"{recall(results, exact_results):>8.3f}{load_seconds:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+
+from src.backend.data.dataset import DatasetLoader
+from src.backend.services.tree_inference import FlatTreeEnsemble
+
+
+def time_call(function, X, repeats):
+    function(X)
+    started_at = time.perf_counter()
+    for _ in range(repeats):
+        function(X)
+    return (time.perf_counter() - started_at) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sklearn and flat-array tree ensemble inference")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, _ = DatasetLoader().prepare_train_test_data()
+    rng = np.random.RandomState(42)
+
+    models = {
+        "random_forest": RandomForestRegressor(random_state=42, n_estimators=100),
+        "gradient_boosting": GradientBoostingRegressor(random_state=42, n_estimators=100)
+    }
+
+    print(f"{'model':<20}{'batch':>8}{'sklearn ms':>12}{'flat ms':>10}{'speedup':>10}{'max diff':>12}")
+    for name, model in models.items():
+        model.fit(X_train, y_train)
+        flat_model = FlatTreeEnsemble.from_estimator(model)
+
+        for batch_size in args.batch_sizes:
+            X = X_test[rng.randint(0, len(X_test), batch_size)]
+            repeats = max(1, args.repeats if batch_size < 10000 else args.repeats // 10)
+            sklearn_ms = time_call(model.predict, X, repeats)
+            flat_ms = time_call(flat_model.predict, X, repeats)
+            max_diff = flat_model.verify(model, X)
+            print(f"{name:<20}{batch_size:>8}{sklearn_ms:>12.3f}{flat_ms:>10.3f}"
+                  f"{sklearn_ms / flat_ms:>10.2f}{max_diff:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
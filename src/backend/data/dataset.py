@@ -1,27 +1,172 @@
 
 import pandas as pd
 import os
-from typing import Dict, List, Tuple, Any
+import glob
+import json
+import hashlib
+from typing import Dict, List, Tuple, Any, Optional, Iterator
 import numpy as np
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 
 
+CACHE_FORMAT_VERSION = 2
+PREPROCESSING_FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 50000
+CATEGORY_MAX_RATIO = 0.5
+FLOAT_KEEP_COLUMNS = ['price_euros']
+
+RESOLUTION_PATTERN = r'(?P<resolution_width>\d+)x(?P<resolution_height>\d+)'
+CPU_GHZ_PATTERN = r'(?P<cpu_ghz>\d+(?:\.\d+)?)\s*GHz'
+CPU_FAMILY_PATTERN = r'^(?P<cpu_family>\S+\s+\S+(?:\s+(?:i\d|M)\b)?)'
+STORAGE_PATTERN = r'(?P<size>\d+(?:\.\d+)?)\s*(?P<unit>GB|TB)\s+(?P<kind>SSD|HDD|Flash Storage|Hybrid)'
+STORAGE_COLUMNS = {'SSD': 'ssd_gb', 'HDD': 'hdd_gb', 'Flash Storage': 'flash_gb', 'Hybrid': 'hybrid_gb'}
+
+
 class DatasetLoader:
 
-    def __init__(self, file_path: str = None):
+    def __init__(self, file_path: str = None, use_cache: bool = True):
         self.file_path = file_path or os.path.join(os.getcwd(), "laptop_price.csv")
+        self.use_cache = use_cache
         self.df = None
+        self.source_hash = None
+        self.source_size = None
+        self.n_rows = None
         self.encoders = {}
         self.scaler = None
+        self.preprocessing_meta = None
+        self.feature_names = None
+
+    def compute_source_hash(self, limit: Optional[int] = None) -> str:
+        digest = hashlib.sha1()
+        remaining = limit
+        with open(self.file_path, 'rb') as f:
+            while remaining is None or remaining > 0:
+                block = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                if remaining is not None:
+                    remaining -= len(block)
+        return digest.hexdigest()
+
+    def has_appended_rows(self, source_size: int, source_hash: str) -> bool:
+        if os.path.getsize(self.file_path) <= source_size:
+            return False
+        return self.compute_source_hash(limit=source_size) == source_hash
+
+    def _cache_path(self, source_hash: str) -> str:
+        base, _ = os.path.splitext(self.file_path)
+        return f"{base}.{source_hash[:16]}.v{CACHE_FORMAT_VERSION}.npz"
+
+    def _read_cache(self, cache_path: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path, allow_pickle=False) as archive:
+                columns = {}
+                for col in archive['__columns__'].tolist():
+                    if f"{col}__codes" in archive:
+                        columns[col] = pd.Categorical.from_codes(archive[f"{col}__codes"],
+                                                                 archive[f"{col}__categories"].astype(object))
+                    else:
+                        columns[col] = archive[col]
+            return self._compact_frame(pd.DataFrame(columns))
+        except Exception as e:
+            print(f"Ignoring unreadable dataset cache {cache_path}: {e}")
+            return None
+
+    def _write_cache(self, df: pd.DataFrame, cache_path: str) -> None:
+        arrays = {'__columns__': np.array(df.columns.tolist(), dtype=str)}
+        for col in df.columns:
+            if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype):
+                codes, categories = pd.factorize(df[col], sort=True)
+                arrays[f"{col}__codes"] = codes.astype(np.int32)
+                arrays[f"{col}__categories"] = np.array(categories.tolist(), dtype=str)
+            else:
+                arrays[col] = df[col].to_numpy()
+
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Could not write dataset cache {cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        base, _ = os.path.splitext(self.file_path)
+        for stale_path in glob.glob(f"{glob.escape(base)}.*.npz"):
+            if stale_path != cache_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
 
     def load_data(self) -> pd.DataFrame:
+        self.source_size = os.path.getsize(self.file_path)
+        self.source_hash = self.compute_source_hash()
+
+        if not self.use_cache:
+            self.df = self._parse_source()
+            self.n_rows = len(self.df)
+            return self.df
+
+        cache_path = self._cache_path(self.source_hash)
+
+        df = self._read_cache(cache_path)
+        if df is None:
+            df = self._parse_source()
+            self._write_cache(df, cache_path)
+
+        self.df = df
+        self.n_rows = len(df)
+        return self.df
+
+    def _parse_source(self) -> pd.DataFrame:
         try:
             encoding = "windows-1250"
-            self.df = pd.read_csv(self.file_path, encoding=encoding)
+            df = pd.read_csv(self.file_path, encoding=encoding)
+        except UnicodeDecodeError:
+            raise ValueError(f"Nie udało się wczytać pliku. Wypróbowano kodowanie {encoding}")
+
+        df = self._clean_frame(df)
+        footprint_before = df.memory_usage(deep=True).sum()
+        df = self._compact_frame(df)
+        footprint_after = df.memory_usage(deep=True).sum()
+        print(f"Catalog memory footprint: {footprint_before / 1024:.0f} KiB -> {footprint_after / 1024:.0f} KiB")
+        return df
+
+    @staticmethod
+    def _compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+        for col in df.columns:
+            series = df[col]
+            if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+                if series.nunique() <= CATEGORY_MAX_RATIO * len(series):
+                    df[col] = series.astype('category')
+                else:
+                    df[col] = series.astype(object)
+            elif pd.api.types.is_numeric_dtype(series) and col not in FLOAT_KEEP_COLUMNS:
+                values = series.to_numpy()
+                if not series.isna().any() and np.array_equal(values, np.round(values)):
+                    df[col] = pd.to_numeric(series, downcast='integer')
+                else:
+                    df[col] = series.astype(np.float32)
+        return df
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        encoding = "windows-1250"
+        try:
+            with pd.read_csv(self.file_path, encoding=encoding, chunksize=chunk_size) as reader:
+                for chunk in reader:
+                    yield self._fill_missing(self._clean_frame(chunk))
         except UnicodeDecodeError:
             raise ValueError(f"Nie udało się wczytać pliku. Wypróbowano kodowanie {encoding}")
 
+    @staticmethod
+    def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
         column_mapping = {
             'laptop_ID': 'laptop_id',
             'Company': 'company',
@@ -37,15 +182,48 @@ class DatasetLoader:
             'Weight': 'weight',
             'Price_euros': 'price_euros'
         }
-        self.df = self.df.rename(columns=column_mapping)
-
-        if 'weight' in self.df.columns:
-            self.df['weight'] = self.df['weight'].str.replace('kg', '').astype(float)
-
-        if 'ram' in self.df.columns:
-            self.df['ram'] = self.df['ram'].astype(str)
-            self.df['ram'] = self.df['ram'].str.replace('GB', '').str.replace('gb', '').str.strip().astype(float)
-        return self.df
+        df = df.rename(columns=column_mapping)
+
+        if 'weight' in df.columns:
+            df['weight'] = df['weight'].str.replace('kg', '').astype(float)
+
+        if 'ram' in df.columns:
+            df['ram'] = df['ram'].astype(str)
+            df['ram'] = df['ram'].str.replace('GB', '').str.replace('gb', '').str.strip().astype(float)
+        return df
+
+    @staticmethod
+    def extract_features(frame: pd.DataFrame) -> pd.DataFrame:
+        derived = pd.DataFrame(index=frame.index)
+
+        if 'screen_resolution' in frame.columns:
+            resolution = frame['screen_resolution'].astype(object)
+            derived = derived.join(resolution.str.extract(RESOLUTION_PATTERN).astype(float))
+            derived['ips'] = resolution.str.contains('IPS', regex=False).astype(float)
+            derived['touchscreen'] = resolution.str.contains('Touchscreen', regex=False).astype(float)
+
+        if 'cpu' in frame.columns:
+            cpu = frame['cpu'].astype(object)
+            derived = derived.join(cpu.str.extract(CPU_GHZ_PATTERN).astype(float))
+            derived['cpu_family'] = cpu.str.extract(CPU_FAMILY_PATTERN)['cpu_family'].fillna('Other')
+
+        storage_columns = list(STORAGE_COLUMNS.values())
+        if 'memory' in frame.columns:
+            memory = frame['memory'].astype(object)
+            parts = memory.str.extractall(STORAGE_PATTERN)
+            if parts.empty:
+                storage = pd.DataFrame(0.0, index=frame.index, columns=storage_columns)
+            else:
+                size_gb = parts['size'].astype(float) * np.where(parts['unit'] == 'TB', 1000.0, 1.0)
+                storage = size_gb.groupby(
+                    [parts.index.get_level_values(0), parts['kind'].map(STORAGE_COLUMNS)]
+                ).sum().unstack(fill_value=0.0)
+                storage = storage.reindex(index=frame.index, columns=storage_columns, fill_value=0.0)
+            derived = derived.join(storage.where(memory.notna()))
+        else:
+            derived = derived.join(pd.DataFrame(np.nan, index=frame.index, columns=storage_columns))
+
+        return frame.drop(columns=[col for col in derived.columns if col in frame.columns]).join(derived)
 
     def get_unique_values(self, column: str) -> List:
         if self.df is None:
@@ -56,86 +234,275 @@ class DatasetLoader:
         if self.df is None:
             self.load_data()
 
-        df_processed = self.df.copy()
+        return self._fill_missing(self.df.copy()), self.get_preprocessing_meta()
 
-        df_processed.fillna({
+    @classmethod
+    def _fill_missing(cls, df: pd.DataFrame) -> pd.DataFrame:
+        return cls._fill_text(df, {
             'screen_resolution': 'Unknown',
             'cpu': 'Unknown',
             'gpu': 'Unknown',
             'operating_system': 'Unknown'
-        }, inplace=True)
-
-        preprocessing_meta = {
-            'categorical_columns': ['company', 'product', 'type', 'screen_resolution',
-                                   'cpu', 'gpu', 'operating_system'],
-            'numerical_columns': ['screen_size', 'ram', 'weight'],
+        })
+
+    @staticmethod
+    def _fill_text(df: pd.DataFrame, values: Dict[str, str]) -> pd.DataFrame:
+        for col, value in values.items():
+            if col not in df.columns or not df[col].isna().any():
+                continue
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories([value])
+            df[col] = df[col].fillna(value)
+        return df
+
+    @staticmethod
+    def get_preprocessing_meta() -> Dict[str, Any]:
+        return {
+            'categorical_columns': ['company', 'product', 'type', 'cpu_family',
+                                   'gpu', 'operating_system'],
+            'numerical_columns': ['screen_size', 'ram', 'weight', 'resolution_width', 'resolution_height',
+                                  'ips', 'touchscreen', 'cpu_ghz', 'ssd_gb', 'hdd_gb', 'flash_gb', 'hybrid_gb'],
             'target_column': 'price_euros'
         }
 
-        return df_processed, preprocessing_meta
+    @classmethod
+    def feature_schema_hash(cls) -> str:
+        schema = {'version': PREPROCESSING_FORMAT_VERSION, **cls.get_preprocessing_meta()}
+        return hashlib.sha1(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def fit_streaming(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        preprocessing_meta = self.get_preprocessing_meta()
+        cat_cols = preprocessing_meta['categorical_columns']
+        num_cols = preprocessing_meta['numerical_columns']
+
+        vocabularies = {col: set() for col in cat_cols}
+        scaler = StandardScaler()
+        n_rows = 0
 
-    def prepare_train_test_data(self, test_size: float = 0.2, random_state: int = 42) -> Tuple:
+        for chunk in self.iter_chunks(chunk_size):
+            chunk = self.extract_features(chunk)
+            for col in cat_cols:
+                vocabularies[col].update(chunk[col].fillna('unknown').unique().tolist())
+            scaler.partial_fit(chunk[num_cols])
+            n_rows += len(chunk)
+
+        self.encoders = {}
+        for col in cat_cols:
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(sorted(vocabularies[col]), dtype=object)
+            self.encoders[col] = {
+                'encoder': encoder,
+                'categories': encoder.classes_.tolist(),
+                'mapping': {cat: idx for idx, cat in enumerate(encoder.classes_)}
+            }
+
+        self.scaler = scaler
+        self.preprocessing_meta = preprocessing_meta
+        self.feature_names = num_cols + [f"{col}_id" for col in cat_cols]
+        return n_rows
+
+    def encode_streaming(
+        self,
+        n_rows: int,
+        output_path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        row_positions: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        cat_cols = self.preprocessing_meta['categorical_columns']
+        target_column = self.preprocessing_meta['target_column']
+        shape = (n_rows, len(self.feature_names))
+
+        if output_path is None:
+            X = np.empty(shape, dtype=np.float32)
+        else:
+            X = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float32, shape=shape)
+        y = np.empty(n_rows)
+
+        start = 0
+        for chunk in self.iter_chunks(chunk_size):
+            end = start + len(chunk)
+            if end > n_rows:
+                raise ValueError(f"{self.file_path} changed while it was being encoded")
+
+            rows = slice(start, end) if row_positions is None else row_positions[start:end]
+            chunk = self._fill_text(self.extract_features(chunk), {col: 'unknown' for col in cat_cols})
+            X[rows] = self._encode_features(chunk)
+            y[rows] = chunk[target_column].to_numpy(dtype=float)
+            start = end
+
+        if start != n_rows:
+            raise ValueError(f"{self.file_path} changed while it was being encoded")
+
+        if output_path is not None:
+            X.flush()
+            del X
+            X = np.load(output_path, mmap_mode='r')
+        return X, y
+
+    def _fit_source(self, chunk_size: int) -> int:
+        self.source_size = os.path.getsize(self.file_path)
+        self.source_hash = self.compute_source_hash()
+        self.n_rows = self.fit_streaming(chunk_size)
+        return self.n_rows
+
+    def prepare_streaming_data(
+        self,
+        output_path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        return self.encode_streaming(self._fit_source(chunk_size), output_path, chunk_size)
+
+    def prepare_train_test_data(
+        self,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        output_path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Tuple:
+        n_rows = self._fit_source(chunk_size)
+        train_idx, test_idx = train_test_split(
+            np.arange(n_rows), test_size=test_size, random_state=random_state
+        )
+
+        row_positions = np.empty(n_rows, dtype=np.intp)
+        row_positions[train_idx] = np.arange(len(train_idx))
+        row_positions[test_idx] = np.arange(len(train_idx), n_rows)
+        X, y = self.encode_streaming(n_rows, output_path, chunk_size, row_positions)
+
+        n_train = len(train_idx)
+        return X[:n_train], X[n_train:], y[:n_train], y[n_train:], self.feature_names
+
+    def extend_categories(self, frame: pd.DataFrame) -> Dict[str, List[str]]:
+        added = {}
+        for col, info in self.encoders.items():
+            if col not in frame.columns:
+                continue
+
+            known = set(info['categories'])
+            new_categories = sorted(str(cat) for cat in frame[col].dropna().unique() if cat not in known)
+            if not new_categories:
+                continue
+
+            for cat in new_categories:
+                info['mapping'][cat] = len(info['categories'])
+                info['categories'].append(cat)
+            info['encoder'].classes_ = np.array(info['categories'], dtype=object)
+            added[col] = new_categories
+        return added
+
+    def prepare_incremental_data(self, base_rows: int, test_size: float = 0.2, random_state: int = 42) -> Tuple:
+        if self.scaler is None or self.preprocessing_meta is None:
+            raise ValueError("Preprocessing has not been fitted. Load a preprocessing state first.")
         if self.df is None:
             self.load_data()
 
-        df_processed, preprocessing_meta = self.preprocess()
+        df_processed, _ = self.preprocess()
+        cat_cols = self.preprocessing_meta['categorical_columns']
+        df_processed = self._fill_text(self.extract_features(df_processed), {col: 'unknown' for col in cat_cols})
 
-        price_column = 'price_euros'
+        added = self.extend_categories(df_processed)
+        for col, categories in added.items():
+            print(f"Added {len(categories)} new {col} categories")
 
-        X = df_processed.drop([price_column], axis=1)
-        y = df_processed[price_column]
+        X_combined = self._encode_features(df_processed).astype(np.float32)
+        y = df_processed[self.preprocessing_meta['target_column']].to_numpy(dtype=np.float64)
 
-        cat_cols = preprocessing_meta['categorical_columns']
-        num_cols = preprocessing_meta['numerical_columns']
+        base_idx = np.arange(min(base_rows, len(df_processed)))
+        base_train, base_test = train_test_split(base_idx, test_size=test_size, random_state=random_state)
 
-        X_cat = X[cat_cols]
-        X_num = X[num_cols]
+        appended_idx = np.arange(len(base_idx), len(df_processed))
+        holdout_every = max(2, int(round(1 / test_size)))
+        is_holdout = appended_idx % holdout_every == 0
 
-        self.encoders = {}
-        X_cat_encoded = np.zeros((X.shape[0], len(cat_cols)))
+        train_idx = np.concatenate([base_train, appended_idx[~is_holdout]])
+        test_idx = np.concatenate([base_test, appended_idx[is_holdout]])
 
-        for i, col in enumerate(cat_cols):
-            encoder = LabelEncoder()
-            X_cat_encoded[:, i] = encoder.fit_transform(X_cat[col].fillna('unknown'))
+        return X_combined[train_idx], X_combined[test_idx], y[train_idx], y[test_idx], self.feature_names
+
+    def get_preprocessing_state(self) -> Dict[str, Any]:
+        if self.scaler is None or self.preprocessing_meta is None:
+            raise ValueError("Preprocessing has not been fitted. Call prepare_train_test_data first.")
 
+        return {
+            'version': PREPROCESSING_FORMAT_VERSION,
+            'categorical_columns': list(self.preprocessing_meta['categorical_columns']),
+            'numerical_columns': list(self.preprocessing_meta['numerical_columns']),
+            'target_column': self.preprocessing_meta['target_column'],
+            'feature_names': list(self.feature_names),
+            'categories': {col: [str(cat) for cat in info['categories']] for col, info in self.encoders.items()},
+            'scaler_mean': self.scaler.mean_.tolist(),
+            'scaler_scale': self.scaler.scale_.tolist(),
+            'scaler_var': self.scaler.var_.tolist(),
+            'n_samples_seen': int(np.max(self.scaler.n_samples_seen_))
+        }
+
+    def set_preprocessing_state(self, state: Dict[str, Any]) -> None:
+        if state.get('version') != PREPROCESSING_FORMAT_VERSION:
+            raise ValueError(f"Unsupported preprocessing format version: {state.get('version')}")
+
+        self.preprocessing_meta = {
+            'categorical_columns': list(state['categorical_columns']),
+            'numerical_columns': list(state['numerical_columns']),
+            'target_column': state['target_column']
+        }
+        self.feature_names = list(state['feature_names'])
+
+        self.encoders = {}
+        for col, categories in state['categories'].items():
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(categories, dtype=object)
             self.encoders[col] = {
                 'encoder': encoder,
-                'categories': encoder.classes_.tolist(),
-                'mapping': {cat: idx for idx, cat in enumerate(encoder.classes_)}
+                'categories': list(categories),
+                'mapping': {cat: idx for idx, cat in enumerate(categories)}
             }
 
+        num_cols = self.preprocessing_meta['numerical_columns']
         self.scaler = StandardScaler()
-        X_num_scaled = self.scaler.fit_transform(X_num)
+        self.scaler.mean_ = np.array(state['scaler_mean'], dtype=float)
+        self.scaler.scale_ = np.array(state['scaler_scale'], dtype=float)
+        self.scaler.var_ = np.array(state['scaler_var'], dtype=float)
+        self.scaler.n_samples_seen_ = state['n_samples_seen']
+        self.scaler.n_features_in_ = len(num_cols)
+        self.scaler.feature_names_in_ = np.array(num_cols, dtype=object)
+
+    def save_preprocessing(self, path: str) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_preprocessing_state(), f)
+        os.replace(tmp_path, path)
+
+    def load_preprocessing(self, path: str) -> None:
+        with open(path, encoding='utf-8') as f:
+            self.set_preprocessing_state(json.load(f))
 
-        X_combined = np.hstack([X_num_scaled, X_cat_encoded])
+    def transform_input_data(self, input_data: Dict[str, Any]) -> np.ndarray:
+        return self.transform_batch([input_data])[0]
 
-        feature_names = num_cols.copy()
-        for col in cat_cols:
-            feature_names.append(f"{col}_id")
+    def transform_batch(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        return self.transform_frame(pd.DataFrame(records, index=range(len(records))))
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_combined, y, test_size=test_size, random_state=random_state
-        )
+    def transform_frame(self, frame: pd.DataFrame, missing_category_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        return self._encode_features(self.extract_features(frame), missing_category_mask)
 
-        return X_train, X_test, y_train, y_test, feature_names
+    def _encode_features(self, frame: pd.DataFrame, missing_category_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        num_cols = self.preprocessing_meta['numerical_columns']
+        cat_cols = self.preprocessing_meta['categorical_columns']
 
-    def transform_input_data(self, input_data: Dict[str, Any]) -> np.ndarray:
-        num_data = []
-        for col in ['screen_size', 'ram', 'weight']:
-            num_data.append(input_data.get(col, 0))
+        X_combined = np.zeros((len(frame), len(num_cols) + len(cat_cols)))
 
-        num_df = pd.DataFrame([num_data], columns=['screen_size', 'ram', 'weight'])
-        num_scaled = self.scaler.transform(num_df)[0]
+        num_data = frame.reindex(columns=num_cols).to_numpy(dtype=float)
+        X_combined[:, :len(num_cols)] = np.nan_to_num((num_data - self.scaler.mean_) / self.scaler.scale_)
 
-        cat_cols = ['company', 'product', 'type', 'screen_resolution', 'cpu', 'gpu', 'operating_system']
-        cat_encoded = np.zeros(len(cat_cols))
-        
         for i, col in enumerate(cat_cols):
-            if col in self.encoders:
-                value = input_data.get(col, '')
-                mapping = self.encoders[col]['mapping']
-                cat_encoded[i] = mapping.get(value, 0)
-
-        X_combined = np.hstack([num_scaled, cat_encoded])
+            if col in self.encoders and col in frame.columns:
+                codes = pd.Categorical(frame[col], categories=self.encoders[col]['categories']).codes
+            else:
+                codes = np.full(len(frame), -1)
+
+            unknown = 0.0
+            if missing_category_mask is not None and missing_category_mask[len(num_cols) + i]:
+                unknown = np.nan
+            X_combined[:, len(num_cols) + i] = np.where(codes < 0, unknown, codes)
 
         return X_combined
@@ -16,6 +16,7 @@ class LaptopSpecification:
     gpu: str
     operating_system: str
     weight: float
+    memory: Optional[str] = None
 
 
 @dataclass
@@ -47,6 +48,8 @@ class RecommendedLaptop:
     specifications: LaptopSpecification
     actual_price: float
     similarity_score: float
+    predicted_price: Optional[float] = None
+    value_score: Optional[float] = None
 
 
 @dataclass
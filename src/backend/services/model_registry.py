@@ -0,0 +1,109 @@
+import os
+import re
+import json
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+
+VERSION_PATTERN = re.compile(r"^v(\d+)$")
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelRegistry:
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.versions_dir = os.path.join(root_dir, "models")
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def list_versions(self) -> List[str]:
+        versions = []
+        for name in os.listdir(self.versions_dir):
+            match = VERSION_PATTERN.match(name)
+            if match and os.path.exists(os.path.join(self.versions_dir, name, MANIFEST_FILE)):
+                versions.append((int(match.group(1)), name))
+        return [name for _, name in sorted(versions)]
+
+    def read_manifest(self, version: str) -> Dict[str, Any]:
+        with open(os.path.join(self.version_path(version), MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def commit(self, write_artifacts: Callable[[str], None], manifest: Dict[str, Any]) -> str:
+        staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=self.versions_dir)
+        try:
+            write_artifacts(staging_dir)
+
+            versions = self.list_versions()
+            next_number = int(VERSION_PATTERN.match(versions[-1]).group(1)) + 1 if versions else 1
+            while True:
+                version = f"v{next_number:06d}"
+                manifest = {
+                    **manifest,
+                    "version": version,
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "files": sorted(os.listdir(staging_dir))
+                }
+                with open(os.path.join(staging_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, indent=2, default=str)
+
+                try:
+                    os.rename(staging_dir, self.version_path(version))
+                    return version
+                except OSError:
+                    if not os.path.exists(self.version_path(version)):
+                        raise
+                    next_number += 1
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+    def get_current(self) -> Optional[str]:
+        current_path = os.path.join(self.root_dir, CURRENT_FILE)
+        if not os.path.exists(current_path):
+            return None
+        with open(current_path, encoding='utf-8') as f:
+            version = f.read().strip()
+        return version if os.path.exists(os.path.join(self.version_path(version), MANIFEST_FILE)) else None
+
+    def set_current(self, version: str) -> None:
+        if version not in self.list_versions():
+            raise ValueError(f"Unknown model version: {version}")
+
+        current_path = os.path.join(self.root_dir, CURRENT_FILE)
+        tmp_path = f"{current_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_path, current_path)
+
+    def is_compatible(self, version: str, feature_schema_hash: Optional[str]) -> bool:
+        if feature_schema_hash is None:
+            return True
+        return self.read_manifest(version).get("feature_schema_hash") == feature_schema_hash
+
+    def resolve(self, feature_schema_hash: Optional[str] = None) -> Optional[str]:
+        current = self.get_current()
+        if current is not None and self.is_compatible(current, feature_schema_hash):
+            return current
+
+        for version in reversed(self.list_versions()):
+            if self.is_compatible(version, feature_schema_hash):
+                return version
+        return None
+
+    def rollback(self, feature_schema_hash: Optional[str] = None) -> Optional[str]:
+        current = self.get_current()
+        versions = self.list_versions()
+        if current in versions:
+            versions = versions[:versions.index(current)]
+
+        for version in reversed(versions):
+            if self.is_compatible(version, feature_schema_hash):
+                self.set_current(version)
+                return version
+        return None
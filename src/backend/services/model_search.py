@@ -0,0 +1,272 @@
+import os
+import math
+import time
+import tempfile
+import joblib
+import numpy as np
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold, ParameterGrid
+
+
+REFIT_BUDGET_SHARE = 0.25
+
+
+def default_training_jobs() -> int:
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _fit_and_score(
+    estimator: Any,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    deadline: Optional[float]
+) -> Tuple[Optional[float], float]:
+    if deadline is not None and time.time() >= deadline:
+        return None, 0.0
+
+    started_at = time.time()
+    model = clone(estimator).set_params(**params)
+    model.fit(X[train_idx], y[train_idx])
+    fit_time = time.time() - started_at
+    return -mean_squared_error(y[test_idx], model.predict(X[test_idx])), fit_time
+
+
+def _fit(estimator: Any, params: Dict[str, Any], X: np.ndarray, y: np.ndarray) -> Any:
+    model = clone(estimator).set_params(**params)
+    model.fit(np.asarray(X), np.asarray(y))
+    return model
+
+
+class BudgetedModelSearch:
+
+    def __init__(
+        self,
+        families: Dict[str, Dict[str, Any]],
+        time_budget: Optional[float] = None,
+        max_fits: Optional[int] = None,
+        cv: int = 3,
+        factor: int = 3,
+        min_samples: int = 50,
+        n_jobs: Optional[int] = None,
+        random_state: int = 42,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.families = families
+        self.time_budget = time_budget
+        self.max_fits = max_fits
+        self.cv = cv
+        self.factor = factor
+        self.min_samples = min_samples
+        self.n_jobs = n_jobs if n_jobs is not None else default_training_jobs()
+        self.random_state = random_state
+        self.progress_callback = progress_callback
+
+        self.fits = 0
+        self.started_at = None
+        self.deadline = None
+        self.best_so_far = None
+
+    def _refit_estimate(self, states: Dict[str, Dict[str, Any]], names: List[str], n_samples: int) -> float:
+        estimates = [states[name]["fit_rate"] * n_samples for name in names]
+        if not estimates:
+            return 0.0
+        return max(max(estimates), sum(estimates) / self.n_jobs)
+
+    def _search_deadline(self, states: Dict[str, Dict[str, Any]], n_samples: int) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        scored = [name for name, state in states.items() if state["best_params"] is not None]
+        reserve = self._refit_estimate(states, scored, n_samples)
+        if not any(state["fit_rate"] > 0 for state in states.values()):
+            reserve = self.time_budget * REFIT_BUDGET_SHARE
+        return self.deadline - reserve
+
+    def _budget_exhausted(self, states: Dict[str, Dict[str, Any]], n_samples: int) -> bool:
+        search_deadline = self._search_deadline(states, n_samples)
+        if search_deadline is not None and time.time() >= search_deadline:
+            return True
+        return self.max_fits is not None and self.fits >= self.max_fits
+
+    def _report(self, **progress) -> None:
+        progress.update({
+            "fits": self.fits,
+            "elapsed": time.time() - self.started_at,
+            "best_so_far": dict(self.best_so_far) if self.best_so_far else None
+        })
+        print(f"Search progress: {progress['family']} {progress['stage']} "
+              f"({progress['fits']} fits, {progress['elapsed']:.1f}s)")
+        if self.progress_callback:
+            self.progress_callback(progress)
+
+    def _rung_sizes(self, n_candidates: int, n_samples: int) -> List[int]:
+        n_rungs = int(math.ceil(math.log(n_candidates, self.factor))) + 1 if n_candidates > 1 else 1
+        while n_rungs > 1 and n_samples // self.factor ** (n_rungs - 1) < self.min_samples:
+            n_rungs -= 1
+
+        sizes = [n_samples // self.factor ** (n_rungs - 1 - i) for i in range(n_rungs)]
+        sizes[-1] = n_samples
+        return sizes
+
+    @staticmethod
+    def _share_array(directory: str, name: str, array: np.ndarray) -> np.ndarray:
+        if isinstance(array, np.memmap) and array.flags.c_contiguous:
+            return array
+
+        path = os.path.join(directory, f"{name}.joblib")
+        joblib.dump(np.ascontiguousarray(array), path)
+        return joblib.load(path, mmap_mode='r')
+
+    @classmethod
+    def _share_training_data(cls, directory: str, X_train: np.ndarray, y_train: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return cls._share_array(directory, "X_train", X_train), cls._share_array(directory, "y_train", y_train)
+
+    def _rung_tasks(self, states: Dict[str, Dict[str, Any]], rung: int) -> List[Tuple[str, int, np.ndarray, np.ndarray]]:
+        family_tasks = []
+        for name, state in states.items():
+            if rung >= len(state["rung_sizes"]) or (rung > 0 and len(state["candidates"]) == 1):
+                continue
+
+            sample_idx = np.sort(state["order"][:state["rung_sizes"][rung]])
+            folds = list(KFold(n_splits=self.cv, shuffle=True, random_state=self.random_state).split(sample_idx))
+            family_tasks.append([
+                [(name, c, sample_idx[train_pos], sample_idx[test_pos]) for train_pos, test_pos in folds]
+                for c in range(len(state["candidates"]))
+            ])
+
+            self._report(family=name, stage=f"rung {rung}", n_candidates=len(state["candidates"]),
+                         n_samples=len(sample_idx))
+
+        tasks = []
+        for position in range(max((len(candidates) for candidates in family_tasks), default=0)):
+            for candidates in family_tasks:
+                if position < len(candidates):
+                    tasks.extend(candidates[position])
+
+        if self.max_fits is not None:
+            remaining = max(self.max_fits - self.fits, 0)
+            tasks = tasks[:remaining - remaining % self.cv if remaining >= self.cv else remaining]
+        return tasks
+
+    def _update_states(
+        self,
+        states: Dict[str, Dict[str, Any]],
+        tasks: List[Tuple],
+        results: List[Tuple[Optional[float], float]]
+    ) -> None:
+        fold_scores = {}
+        for (name, c, train_idx, _), (score, fit_time) in zip(tasks, results):
+            if score is not None:
+                fold_scores.setdefault(name, {}).setdefault(c, []).append(score)
+                states[name]["fit_rate"] = max(states[name]["fit_rate"], fit_time / len(train_idx))
+                self.fits += 1
+
+        for name in {task[0] for task in tasks}:
+            state = states[name]
+            scored = sorted(
+                [(float(np.mean(values)), c) for c, values in fold_scores.get(name, {}).items() if len(values) == self.cv],
+                key=lambda item: item[0],
+                reverse=True
+            )
+            if not scored:
+                state["finished"] = True
+                continue
+
+            state["best_score"], best_index = scored[0]
+            state["best_params"] = state["candidates"][best_index]
+            keep = max(1, int(math.ceil(len(scored) / self.factor)))
+            state["candidates"] = [state["candidates"][c] for _, c in scored[:keep]]
+
+            if self.best_so_far is None or state["best_score"] > self.best_so_far["cv_score"]:
+                self.best_so_far = {"model_type": name, "params": state["best_params"], "cv_score": state["best_score"]}
+
+    def _select_refits(self, states: Dict[str, Dict[str, Any]], n_samples: int) -> List[str]:
+        ranked = sorted(
+            [name for name, state in states.items() if state["best_params"] is not None],
+            key=lambda name: states[name]["best_score"] if states[name]["best_score"] is not None else -np.inf,
+            reverse=True
+        )
+        if self.deadline is None:
+            return ranked
+
+        remaining = self.deadline - time.time()
+        selected = ranked[:1]
+        print(f"Refitting within {remaining:.1f}s of remaining search budget")
+        for name in ranked[1:]:
+            if self._refit_estimate(states, selected + [name], n_samples) <= remaining:
+                selected.append(name)
+        return selected
+
+    def run(self, X_train: np.ndarray, y_train: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        self.fits = 0
+        self.best_so_far = None
+        self.started_at = time.time()
+        self.deadline = self.started_at + self.time_budget if self.time_budget is not None else None
+
+        n_samples = np.asarray(X_train).shape[0]
+        rng = np.random.RandomState(self.random_state)
+        order = rng.permutation(n_samples)
+
+        states = {}
+        for name, family in self.families.items():
+            candidates = list(ParameterGrid(family["params"])) if family["params"] else [{}]
+            states[name] = {
+                "candidates": candidates,
+                "rung_sizes": self._rung_sizes(len(candidates), n_samples),
+                "order": order,
+                "best_params": None if family["params"] else {},
+                "best_score": None,
+                "fit_rate": 0.0,
+                "finished": False
+            }
+
+        with tempfile.TemporaryDirectory(prefix="lapimate-search-") as shared_dir:
+            X, y = self._share_training_data(shared_dir, X_train, y_train)
+
+            with Parallel(n_jobs=self.n_jobs) as parallel:
+                rung = 0
+                while not self._budget_exhausted(states, n_samples):
+                    active = {name: state for name, state in states.items() if not state["finished"]}
+                    tasks = self._rung_tasks(active, rung)
+                    if not tasks:
+                        break
+
+                    search_deadline = self._search_deadline(states, n_samples)
+                    results = parallel(
+                        delayed(_fit_and_score)(
+                            self.families[name]["model"], states[name]["candidates"][c],
+                            X, y, train_idx, test_idx, search_deadline
+                        )
+                        for name, c, train_idx, test_idx in tasks
+                    )
+                    self._update_states(states, tasks, results)
+                    rung += 1
+
+                selected = self._select_refits(states, n_samples)
+                skipped = [name for name in states if name not in selected]
+                if skipped:
+                    print(f"Search budget exhausted, skipping {', '.join(skipped)}")
+
+                models = parallel(
+                    delayed(_fit)(self.families[name]["model"], states[name]["best_params"], X, y)
+                    for name in selected
+                )
+
+            del X, y
+
+        self.fits += len(selected)
+        results = {}
+        for name, model in zip(selected, models):
+            results[name] = {
+                "model": model,
+                "params": states[name]["best_params"],
+                "cv_score": states[name]["best_score"]
+            }
+            self._report(family=name, stage="done", n_candidates=len(states[name]["candidates"]), n_samples=n_samples)
+
+        return results
@@ -1,57 +1,130 @@
 import os
+import time
+import tempfile
+import threading
 import joblib
 import numpy as np
-from typing import Dict, Any, Tuple, List, Optional
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+import pandas as pd
+from dataclasses import replace
+from typing import Dict, Any, Tuple, List, Optional, Callable
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.model_selection import GridSearchCV
+from threadpoolctl import threadpool_limits
 
 from src.backend.data.dataset import DatasetLoader
 from src.backend.domain.models import LaptopSpecification, PricePrediction
+from src.backend.services.uncertainty_service import UncertaintyEstimator
+from src.backend.services.prediction_cache import PredictionCache
+from src.backend.services.model_search import BudgetedModelSearch, default_training_jobs
+from src.backend.services.model_registry import ModelRegistry
+from src.backend.services.tree_inference import FlatTreeEnsemble
+
+
+DEFAULT_SEARCH_TIME_BUDGET = 300.0
+DEFAULT_INCREMENTAL_ESTIMATORS = 20
+DEFAULT_MAX_R2_DROP = 0.02
+MODEL_FILE = "model.joblib"
+PREPROCESSING_FILE = "preprocessing.json"
+INTERVAL_FILE = "interval.joblib"
+FLAT_ENSEMBLE_DIR = "flat_ensemble"
+TRAINING_MATRIX_FILE = "X.npy"
 
 
 class ModelService:
 
-    def __init__(self, model_dir: str = "/tmp", dataset_loader: Optional[DatasetLoader] = None):
+    def __init__(
+        self,
+        model_dir: str = "/tmp",
+        dataset_loader: Optional[DatasetLoader] = None,
+        cache_size: int = 1024,
+        load_mode: str = "memory",
+        inference_backend: str = "auto",
+        flat_batch_threshold: int = 200,
+        training_jobs: Optional[int] = None
+    ):
 
         self.model_dir = model_dir
+        self.load_mode = load_mode
+        self.inference_backend = inference_backend
+        self.flat_batch_threshold = flat_batch_threshold
+        self.training_jobs = training_jobs if training_jobs is not None else default_training_jobs()
         self.model = None
+        self.flat_model = None
+        self.model_version = None
+        self.model_manifest = None
         self.dataset_loader = dataset_loader if dataset_loader else DatasetLoader()
+        self.uncertainty = UncertaintyEstimator()
+        self.prediction_cache = PredictionCache(max_size=cache_size)
+        self._model_listeners = []
+        self._lock = threading.RLock()
 
         os.makedirs(self.model_dir, exist_ok=True)
+        self.registry = ModelRegistry(self.model_dir)
+
+    def _new_training_loader(self) -> DatasetLoader:
+        return DatasetLoader(self.dataset_loader.file_path, use_cache=self.dataset_loader.use_cache)
+
+    def _training_threads(self) -> threadpool_limits:
+        return threadpool_limits(limits=self.training_jobs)
 
-    def train_model(self, model_type: str = "random_forest") -> Dict[str, float]:
+    def train_model(self, model_type: str = "random_forest", publish: bool = True) -> Dict[str, Any]:
         print(f"Training model {model_type}")
-        X_train, X_test, y_train, y_test, feature_names = self.dataset_loader.prepare_train_test_data()
+        started_at = time.time()
+        dataset_loader = self._new_training_loader()
+        X_train, X_test, y_train, y_test, feature_names = dataset_loader.prepare_train_test_data()
 
         if model_type == "linear":
-            self.model = LinearRegression()
+            model = LinearRegression()
         elif model_type == "gradient_boosting":
-            self.model = GradientBoostingRegressor(random_state=42)
+            model = GradientBoostingRegressor(random_state=42)
+        elif model_type == "hist_gradient_boosting":
+            model = HistGradientBoostingRegressor(
+                random_state=42,
+                categorical_features=self._categorical_feature_mask(dataset_loader)
+            )
         else:
-            self.model = RandomForestRegressor(random_state=42, n_estimators=100)
+            model = RandomForestRegressor(random_state=42, n_estimators=100)
 
-        self.model.fit(X_train, y_train)
+        uncertainty = UncertaintyEstimator()
+        with self._training_threads():
+            model.fit(X_train, y_train)
+            uncertainty.fit(model, X_train, y_train)
 
-        y_pred = self.model.predict(X_test)
+        y_pred = model.predict(X_test)
         mse = mean_squared_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
 
-        model_path = os.path.join(self.model_dir, f"{model_type}_model.joblib")
-        joblib.dump(self.model, model_path)
-
-        return {
+        model_info = {
             "model_type": model_type,
+            "model": model,
+            "params": {},
+            "dataset_loader": dataset_loader,
+            "uncertainty": uncertainty,
             "mse": mse,
             "rmse": np.sqrt(mse),
-            "r2": r2
+            "r2": r2,
+            "training_time": time.time() - started_at
         }
 
-    def find_best_model(self) -> Dict[str, Any]:
-        X_train, X_test, y_train, y_test, feature_names = self.dataset_loader.prepare_train_test_data()
+        if publish:
+            self.publish_model(model_info)
+
+        return model_info
 
-        models = {
+    @staticmethod
+    def _categorical_feature_mask(dataset_loader: DatasetLoader, max_categories: int = 255) -> np.ndarray:
+        num_cols = dataset_loader.preprocessing_meta['numerical_columns']
+        cat_cols = dataset_loader.preprocessing_meta['categorical_columns']
+
+        mask = np.zeros(len(num_cols) + len(cat_cols), dtype=bool)
+        for i, col in enumerate(cat_cols):
+            mask[len(num_cols) + i] = len(dataset_loader.encoders[col]['categories']) <= max_categories
+        return mask
+
+    def _model_families(self, dataset_loader: DatasetLoader) -> Dict[str, Dict[str, Any]]:
+        return {
             "linear": {
                 "model": LinearRegression(),
                 "params": {}
@@ -69,16 +142,21 @@ class ModelService:
                     "n_estimators": [50, 100, 200],
                     "learning_rate": [0.01, 0.1, 0.2]
                 }
+            },
+            "hist_gradient_boosting": {
+                "model": HistGradientBoostingRegressor(
+                    random_state=42,
+                    categorical_features=self._categorical_feature_mask(dataset_loader)
+                ),
+                "params": {
+                    "max_iter": [100, 200, 400],
+                    "learning_rate": [0.05, 0.1, 0.2]
+                }
             }
         }
 
-        best_model_info = {
-            "model_type": None,
-            "model": None,
-            "rmse": float('inf'),
-            "r2": -float('inf')
-        }
-
+    def _grid_search_families(self, models: Dict[str, Dict[str, Any]], X_train, y_train) -> Dict[str, Dict[str, Any]]:
+        results = {}
         for model_name, model_info in models.items():
             print(f"Training {model_name}...")
 
@@ -88,15 +166,85 @@ class ModelService:
                     model_info["params"],
                     cv=5,
                     scoring="neg_mean_squared_error",
-                    n_jobs=-1
+                    n_jobs=self.training_jobs
                 )
                 grid_search.fit(X_train, y_train)
-                best_model = grid_search.best_estimator_
-                best_params = grid_search.best_params_
+                results[model_name] = {
+                    "model": grid_search.best_estimator_,
+                    "params": grid_search.best_params_
+                }
             else:
                 best_model = model_info["model"]
                 best_model.fit(X_train, y_train)
-                best_params = {}
+                results[model_name] = {"model": best_model, "params": {}}
+        return results
+
+    def find_best_model(
+        self,
+        strategy: str = "halving",
+        time_budget: Optional[float] = DEFAULT_SEARCH_TIME_BUDGET,
+        max_fits: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        publish: bool = True
+    ) -> Dict[str, Any]:
+        started_at = time.time()
+        dataset_loader = self._new_training_loader()
+
+        with tempfile.TemporaryDirectory(prefix="lapimate-train-") as data_dir:
+            X_train, X_test, y_train, y_test, _ = dataset_loader.prepare_train_test_data(
+                output_path=os.path.join(data_dir, TRAINING_MATRIX_FILE)
+            )
+            best_model_info = self._search_best_model(
+                dataset_loader, X_train, X_test, y_train, y_test,
+                strategy, time_budget, max_fits, progress_callback
+            )
+            del X_train, X_test
+
+        best_model_info["dataset_loader"] = dataset_loader
+        best_model_info["training_time"] = time.time() - started_at
+
+        if publish:
+            self.publish_model(best_model_info)
+
+        return best_model_info
+
+    def _search_best_model(
+        self,
+        dataset_loader: DatasetLoader,
+        X_train,
+        X_test,
+        y_train,
+        y_test,
+        strategy: str,
+        time_budget: Optional[float],
+        max_fits: Optional[int],
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> Dict[str, Any]:
+        models = self._model_families(dataset_loader)
+
+        with self._training_threads():
+            if strategy == "grid":
+                search_results = self._grid_search_families(models, X_train, y_train)
+            else:
+                search = BudgetedModelSearch(
+                    models,
+                    time_budget=time_budget,
+                    max_fits=max_fits,
+                    n_jobs=self.training_jobs,
+                    progress_callback=progress_callback
+                )
+                search_results = search.run(X_train, y_train)
+
+        best_model_info = {
+            "model_type": None,
+            "model": None,
+            "rmse": float('inf'),
+            "r2": -float('inf')
+        }
+
+        for model_name, result in search_results.items():
+            best_model = result["model"]
+            best_params = result["params"]
 
             y_pred = best_model.predict(X_test)
             mse = mean_squared_error(y_test, y_pred)
@@ -110,64 +258,347 @@ class ModelService:
                     "model_type": model_name,
                     "model": best_model,
                     "params": best_params,
+                    "mse": mse,
                     "rmse": rmse,
                     "r2": r2
                 }
 
-        best_model_path = os.path.join(self.model_dir, "best_model.joblib")
-        joblib.dump(best_model_info["model"], best_model_path)
-        self.model = best_model_info["model"]
-
+        uncertainty = UncertaintyEstimator()
+        with self._training_threads():
+            uncertainty.fit(best_model_info["model"], X_train, y_train)
+        best_model_info["uncertainty"] = uncertainty
         return best_model_info
 
-    def load_model(self, model_name: str = "best_model") -> bool:
-        model_path = os.path.join(self.model_dir, f"{model_name}.joblib")
-
-        if os.path.exists(model_path):
-            self.model = joblib.load(model_path)
-            return True
+    @staticmethod
+    def _grow_model(model: Any, extra_estimators: int) -> Optional[Dict[str, Any]]:
+        if isinstance(model, HistGradientBoostingRegressor):
+            params = {"max_iter": model.n_iter_ + extra_estimators}
+        elif isinstance(model, (RandomForestRegressor, GradientBoostingRegressor)):
+            params = {"n_estimators": len(model.estimators_) + extra_estimators}
+        elif isinstance(model, LinearRegression):
+            return {}
         else:
-            return False
+            return None
+
+        model.set_params(warm_start=True, **params)
+        return params
+
+    def update_model(
+        self,
+        extra_estimators: int = DEFAULT_INCREMENTAL_ESTIMATORS,
+        publish: bool = True,
+        max_r2_drop: float = DEFAULT_MAX_R2_DROP
+    ) -> Optional[Dict[str, Any]]:
+        started_at = time.time()
+        with self._lock:
+            version, manifest = self.model_version, self.model_manifest
+
+        if version is None or manifest.get("training_data_size") is None:
+            return None
+
+        dataset_loader = self._new_training_loader()
+        if not dataset_loader.has_appended_rows(manifest["training_data_size"], manifest["training_data_hash"]):
+            return None
+
+        version_dir = self.registry.version_path(version)
+        dataset_loader.load_preprocessing(os.path.join(version_dir, PREPROCESSING_FILE))
+        dataset_loader.load_data()
+
+        base_rows = manifest.get("base_rows", manifest["training_rows"])
+        X_train, X_test, y_train, y_test, feature_names = dataset_loader.prepare_incremental_data(base_rows)
+        print(f"Updating {manifest['model_type']} with {len(dataset_loader.df) - manifest['training_rows']} appended rows")
+
+        model = joblib.load(os.path.join(version_dir, MODEL_FILE))
+        if isinstance(model, HistGradientBoostingRegressor) and np.any(
+            np.asarray(model.categorical_features) & ~self._categorical_feature_mask(dataset_loader)
+        ):
+            print("Categorical features outgrew the histogram bins, a full retrain is required")
+            return None
+
+        baseline_r2 = r2_score(y_test, model.predict(X_test))
+
+        grown_params = self._grow_model(model, extra_estimators)
+        if grown_params is None:
+            return None
+        uncertainty = UncertaintyEstimator()
+        interval_path = os.path.join(version_dir, INTERVAL_FILE)
+        with self._training_threads():
+            model.fit(X_train, y_train)
+            if grown_params:
+                model.set_params(warm_start=False)
+
+            if os.path.exists(interval_path):
+                interval_models = joblib.load(interval_path)
+                for interval_model in interval_models:
+                    self._grow_model(interval_model, extra_estimators)
+                    interval_model.fit(X_train, y_train)
+                    interval_model.set_params(warm_start=False)
+                uncertainty.set_interval_models(interval_models)
+            else:
+                uncertainty.fit(model, X_train, y_train)
 
-    def predict_price(self, laptop_spec: LaptopSpecification) -> PricePrediction:
-        if self.model is None:
-            if not self.load_model():
-                raise ValueError("Model not found. Please ensure the model has been trained first.")
-
-        model_type = type(self.model).__name__
-        print(f"Making prediction using model: {model_type}")
-
-        input_data = {
-            "company": laptop_spec.company,
-            "product": laptop_spec.product,
-            "type": laptop_spec.type_name,
-            "screen_size": laptop_spec.screen_size,
-            "screen_resolution": laptop_spec.screen_resolution,
-            "cpu": laptop_spec.cpu,
-            "ram": laptop_spec.ram,
-            "gpu": laptop_spec.gpu,
-            "operating_system": laptop_spec.operating_system,
-            "weight": laptop_spec.weight
+        y_pred = model.predict(X_test)
+        mse = mean_squared_error(y_test, y_pred)
+        r2 = r2_score(y_test, y_pred)
+        print(f"{manifest['model_type']} update - RMSE: {np.sqrt(mse):.2f}, R²: {r2:.2f} (before: {baseline_r2:.2f})")
+
+        model_info = {
+            "model_type": manifest["model_type"],
+            "model": model,
+            "params": {**manifest.get("params", {}), **grown_params},
+            "dataset_loader": dataset_loader,
+            "uncertainty": uncertainty,
+            "mse": mse,
+            "rmse": np.sqrt(mse),
+            "r2": r2,
+            "baseline_r2": baseline_r2,
+            "base_rows": base_rows,
+            "update": "incremental",
+            "training_time": time.time() - started_at,
+            "published": False
         }
 
-        X = self.dataset_loader.transform_input_data(input_data)
+        if publish and r2 < baseline_r2 - max_r2_drop:
+            print(f"Not publishing {manifest['model_type']} update: R² dropped from {baseline_r2:.4f} to {r2:.4f}")
+        elif publish:
+            self.publish_model(model_info)
+            model_info["published"] = True
+
+        return model_info
+
+    def publish_model(self, model_info: Dict[str, Any]) -> str:
+        dataset_loader = model_info["dataset_loader"]
+        uncertainty = model_info["uncertainty"]
+        flat_model = self._export_flat_model(model_info["model"])
+
+        def write_artifacts(version_dir: str) -> None:
+            joblib.dump(model_info["model"], os.path.join(version_dir, MODEL_FILE))
+            dataset_loader.save_preprocessing(os.path.join(version_dir, PREPROCESSING_FILE))
+            if uncertainty.interval_models is not None:
+                joblib.dump(uncertainty.interval_models, os.path.join(version_dir, INTERVAL_FILE))
+            if flat_model is not None:
+                flat_model.save(os.path.join(version_dir, FLAT_ENSEMBLE_DIR))
+
+        manifest = {
+            "model_type": model_info["model_type"],
+            "estimator": type(model_info["model"]).__name__,
+            "params": model_info.get("params", {}),
+            "metrics": {
+                "mse": float(model_info["mse"]),
+                "rmse": float(model_info["rmse"]),
+                "r2": float(model_info["r2"])
+            },
+            "feature_schema_hash": DatasetLoader.feature_schema_hash(),
+            "feature_names": dataset_loader.feature_names,
+            "training_data_hash": dataset_loader.source_hash,
+            "training_data_size": dataset_loader.source_size,
+            "training_rows": dataset_loader.n_rows,
+            "base_rows": model_info.get("base_rows", dataset_loader.n_rows),
+            "update": model_info.get("update", "full"),
+            "training_time": model_info.get("training_time"),
+            "parent_version": self.model_version
+        }
+
+        version = self.registry.commit(write_artifacts, manifest)
+        self.registry.set_current(version)
+        print(f"Published model version {version}")
+
+        self._set_model(model_info["model"], dataset_loader, uncertainty, version,
+                        self.registry.read_manifest(version), flat_model)
+        return version
+
+    @staticmethod
+    def _export_flat_model(model: Any) -> Optional[FlatTreeEnsemble]:
+        if not FlatTreeEnsemble.supports(model):
+            return None
+
+        flat_model = FlatTreeEnsemble.from_estimator(model)
+        probe = np.random.RandomState(0).normal(scale=3.0, size=(256, flat_model.n_features))
+        mismatch = flat_model.verify(model, probe)
+        if mismatch > 1e-6:
+            print(f"Flat export of {type(model).__name__} differs from sklearn by {mismatch}, not using it")
+            return None
+        return flat_model
+
+    def load_model(self, version: Optional[str] = None) -> bool:
+        if version is None:
+            version = self.registry.resolve(DatasetLoader.feature_schema_hash())
+        if version is None:
+            return False
 
-        predicted_price = self.model.predict([X])[0]
+        version_dir = self.registry.version_path(version)
+        manifest = self.registry.read_manifest(version)
 
-        confidence_interval = None
-        if hasattr(self.model, 'estimators_'):
+        dataset_loader = self._new_training_loader()
+        dataset_loader.load_preprocessing(os.path.join(version_dir, PREPROCESSING_FILE))
+
+        uncertainty = UncertaintyEstimator()
+        interval_path = os.path.join(version_dir, INTERVAL_FILE)
+        uncertainty.set_interval_models(joblib.load(interval_path) if os.path.exists(interval_path) else None)
+
+        flat_model = None
+        flat_ensemble_dir = os.path.join(version_dir, FLAT_ENSEMBLE_DIR)
+        if self.load_mode == "mmap" and os.path.isdir(flat_ensemble_dir):
+            flat_model = FlatTreeEnsemble.load(flat_ensemble_dir, mmap_mode='r')
+
+        if flat_model is not None and flat_model.aggregation == "mean":
+            model = flat_model
+        else:
+            model = joblib.load(os.path.join(version_dir, MODEL_FILE))
+
+        self._set_model(model, dataset_loader, uncertainty, version, manifest, flat_model)
+        return True
+
+    def rollback_model(self) -> Optional[str]:
+        version = self.registry.rollback(DatasetLoader.feature_schema_hash())
+        if version is not None:
+            self.load_model(version)
+        return version
+
+    def _set_model(
+        self,
+        model: Any,
+        dataset_loader: DatasetLoader,
+        uncertainty: UncertaintyEstimator,
+        version: str,
+        manifest: Dict[str, Any],
+        flat_model: Optional[FlatTreeEnsemble] = None
+    ) -> None:
+        if isinstance(model, FlatTreeEnsemble):
+            flat_model = model
+        elif flat_model is None and (
+            self.inference_backend == "flat"
+            or (self.inference_backend == "auto" and FlatTreeEnsemble.is_forest(model))
+        ):
+            flat_model = self._export_flat_model(model)
+
+        with self._lock:
+            self.model = model
+            self.flat_model = flat_model
+            self.dataset_loader = dataset_loader
+            self.uncertainty = uncertainty
+            self.model_version = version
+            self.model_manifest = manifest
+            self.prediction_cache.clear()
+            listeners = list(self._model_listeners)
+
+        for listener in listeners:
             try:
-                predictions = []
-                for tree in self.model.estimators_:
-                    predictions.append(tree.predict([X])[0])
-
-                lower = np.percentile(predictions, 2.5)
-                upper = np.percentile(predictions, 97.5)
-                confidence_interval = (lower, upper)
-            except:
-                pass
-
-        return PricePrediction(
-            predicted_price=predicted_price,
-            confidence_interval=confidence_interval
-        )
+                listener(version)
+            except Exception as e:
+                print(f"Model listener failed for version {version}: {e}")
+
+    def add_model_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            self._model_listeners.append(listener)
+
+    def _serving_state(self) -> Tuple[Any, Optional[FlatTreeEnsemble], DatasetLoader, UncertaintyEstimator, str]:
+        with self._lock:
+            return self.model, self.flat_model, self.dataset_loader, self.uncertainty, self.model_version
+
+    def _select_predictor(self, model: Any, flat_model: Optional[FlatTreeEnsemble], n_rows: int) -> Any:
+        if flat_model is None or self.inference_backend == "sklearn":
+            return model
+        if self.inference_backend == "flat":
+            return flat_model
+        if flat_model.supports_tree_intervals and n_rows <= self.flat_batch_threshold:
+            return flat_model
+        return model
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return self.prediction_cache.stats()
+
+    def _ensure_model(self) -> None:
+        with self._lock:
+            if self.model is None:
+                if not self.load_model():
+                    raise ValueError("Model not found. Please ensure the model has been trained first.")
+
+    @staticmethod
+    def _transform_frame(model: Any, dataset_loader: DatasetLoader, frame: pd.DataFrame) -> np.ndarray:
+        missing_category_mask = None
+        if isinstance(model, HistGradientBoostingRegressor) and model.categorical_features is not None:
+            missing_category_mask = np.asarray(model.categorical_features, dtype=bool)
+        return dataset_loader.transform_frame(frame, missing_category_mask)
+
+    @staticmethod
+    def _specs_to_frame(laptop_specs: List[LaptopSpecification]) -> pd.DataFrame:
+        return pd.DataFrame({
+            "company": [spec.company for spec in laptop_specs],
+            "product": [spec.product for spec in laptop_specs],
+            "type": [spec.type_name for spec in laptop_specs],
+            "screen_size": [spec.screen_size for spec in laptop_specs],
+            "screen_resolution": [spec.screen_resolution for spec in laptop_specs],
+            "cpu": [spec.cpu for spec in laptop_specs],
+            "ram": [spec.ram for spec in laptop_specs],
+            "gpu": [spec.gpu for spec in laptop_specs],
+            "operating_system": [spec.operating_system for spec in laptop_specs],
+            "weight": [spec.weight for spec in laptop_specs],
+            "memory": [spec.memory for spec in laptop_specs]
+        })
+
+    def predict_price(self, laptop_spec: LaptopSpecification) -> PricePrediction:
+        return self.predict_prices([laptop_spec])[0]
+
+    def predict_prices(self, laptop_specs: List[LaptopSpecification]) -> List[PricePrediction]:
+        if not laptop_specs:
+            return []
+
+        self._ensure_model()
+        model, flat_model, dataset_loader, uncertainty, model_version = self._serving_state()
+
+        cache_keys = [PredictionCache.make_key(spec, model_version) for spec in laptop_specs]
+        results = [self.prediction_cache.get(key) for key in cache_keys]
+
+        pending = {}
+        for i, (key, cached) in enumerate(zip(cache_keys, results)):
+            if cached is None:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            pending_specs = [laptop_specs[positions[0]] for positions in pending.values()]
+            predictor = self._select_predictor(model, flat_model, len(pending_specs))
+            predictions = self._predict_uncached(pending_specs, predictor, dataset_loader, uncertainty)
+            for key, prediction in zip(pending, predictions):
+                self.prediction_cache.put(key, prediction)
+                for i in pending[key]:
+                    results[i] = replace(prediction)
+
+        return results
+
+    def predict_catalog(self, catalog: pd.DataFrame) -> Tuple[str, np.ndarray]:
+        self._ensure_model()
+        model, flat_model, dataset_loader, _, model_version = self._serving_state()
+
+        predictor = self._select_predictor(model, flat_model, len(catalog))
+        print(f"Scoring {len(catalog)} catalog rows with model version {model_version}")
+
+        X = self._transform_frame(model, dataset_loader, catalog)
+        return model_version, np.asarray(predictor.predict(X), dtype=float)
+
+    def _predict_uncached(
+        self,
+        laptop_specs: List[LaptopSpecification],
+        model: Any,
+        dataset_loader: DatasetLoader,
+        uncertainty: UncertaintyEstimator
+    ) -> List[PricePrediction]:
+        model_type = type(model).__name__
+        print(f"Making {len(laptop_specs)} prediction(s) using model: {model_type}")
+
+        X = self._transform_frame(model, dataset_loader, self._specs_to_frame(laptop_specs))
+
+        predicted_prices = model.predict(X)
+
+        confidence_intervals = [None] * len(laptop_specs)
+        intervals = uncertainty.predict_intervals(model, X)
+        if intervals is not None:
+            confidence_intervals = [(lower, upper) for lower, upper in intervals]
+
+        return [
+            PricePrediction(
+                predicted_price=predicted_price,
+                confidence_interval=confidence_interval
+            )
+            for predicted_price, confidence_interval in zip(predicted_prices, confidence_intervals)
+        ]
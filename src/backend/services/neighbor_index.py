@@ -0,0 +1,286 @@
+import os
+import copy
+import json
+import joblib
+import numpy as np
+from scipy import sparse
+from typing import Any, Dict, Optional, Tuple
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.neighbors import BallTree
+
+
+INDEX_META_FILE = "index.json"
+VECTORS_FILE = "vectors.npy"
+SPARSE_VECTORS_FILE = "vectors.npz"
+BATCH_SCORE_BYTES = 64 * 1024 * 1024
+
+
+def squared_norms(vectors) -> np.ndarray:
+    if sparse.issparse(vectors):
+        return np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel()
+    return np.einsum('ij,ij->i', vectors, vectors)
+
+
+def top_k(scores: np.ndarray, k: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    if positions is None:
+        positions = np.arange(len(scores))
+
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=int)
+
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((positions[candidates], -scores[candidates]))
+    return candidates[order[:k]]
+
+
+class ExactIndex:
+
+    kind = "exact"
+
+    def __init__(self, brute_force_rows: Optional[int] = None):
+        self.brute_force_rows = brute_force_rows
+        self.vectors = None
+
+    def build(self, vectors: np.ndarray) -> "ExactIndex":
+        self.vectors = vectors
+        return self
+
+    def get_params(self) -> Dict[str, Any]:
+        return {"brute_force_rows": self.brute_force_rows}
+
+    def extend(self, vectors) -> "ExactIndex":
+        extended = copy.copy(self)
+        if sparse.issparse(self.vectors):
+            extended.vectors = sparse.vstack([self.vectors, vectors], format='csr')
+        else:
+            extended.vectors = np.vstack([self.vectors, vectors])
+        extended._extend_structure(self.vectors.shape[0], vectors)
+        return extended
+
+    def _extend_structure(self, start: int, vectors) -> None:
+        pass
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        candidates: Optional[np.ndarray] = None,
+        **search_kwargs
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if candidates is None:
+            return self._search(query, k, **search_kwargs)
+        if self.brute_force_rows is None or len(candidates) <= self.brute_force_rows:
+            return self._rank(candidates, query, k)
+
+        allowed = np.zeros(self.vectors.shape[0], dtype=bool)
+        allowed[candidates] = True
+        fetch = k * 2 * int(np.ceil(self.vectors.shape[0] / len(candidates)))
+        while True:
+            positions, scores = self._search(query, fetch, **search_kwargs)
+            keep = allowed[positions]
+            if keep.sum() >= k:
+                return positions[keep][:k], scores[keep][:k]
+            if len(positions) < fetch or fetch >= self.vectors.shape[0]:
+                return self._rank(candidates, query, k)
+            fetch *= 4
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        k: int,
+        candidates: Optional[np.ndarray] = None,
+        max_bytes: int = BATCH_SCORE_BYTES
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = np.arange(self.vectors.shape[0]) if candidates is None else np.unique(candidates)
+        vectors = self.vectors if len(candidates) == self.vectors.shape[0] else self.vectors[candidates]
+        k = min(k, len(candidates))
+
+        positions = np.empty((len(queries), k), dtype=int)
+        best_scores = np.empty((len(queries), k), dtype=np.float32)
+        if k == 0:
+            return positions, best_scores
+
+        block_rows = max(1, max_bytes // (4 * len(candidates)))
+        for start in range(0, len(queries), block_rows):
+            scores = np.asarray(vectors @ queries[start:start + block_rows].T).T
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            rows = np.arange(len(scores))[:, None]
+
+            thresholds = scores[rows, best].min(axis=1)
+            ties = np.flatnonzero((scores >= thresholds[:, None]).sum(axis=1) > k)
+            for row in ties:
+                best[row] = top_k(scores[row], k)
+
+            order = np.lexsort((best, -scores[rows, best]), axis=1)
+            best = best[rows, order]
+            positions[start:start + len(scores)] = candidates[best]
+            best_scores[start:start + len(scores)] = scores[rows, best]
+
+        return positions, best_scores
+
+    def _search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = self.vectors @ query
+        positions = top_k(scores, k)
+        return positions, scores[positions]
+
+    def _rank(self, candidates: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = np.unique(candidates)
+        scores = self.vectors[candidates] @ query
+        best = top_k(scores, k, candidates)
+        return candidates[best], scores[best]
+
+    def _save_structure(self, directory: str) -> None:
+        pass
+
+    def _load_structure(self, directory: str, mmap_mode: Optional[str]) -> None:
+        pass
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        is_sparse = sparse.issparse(self.vectors)
+        if is_sparse:
+            sparse.save_npz(os.path.join(directory, SPARSE_VECTORS_FILE), self.vectors.tocsr(), compressed=False)
+        else:
+            np.save(os.path.join(directory, VECTORS_FILE), np.ascontiguousarray(self.vectors))
+        self._save_structure(directory)
+
+        with open(os.path.join(directory, INDEX_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({"kind": self.kind, "params": self.get_params(), "sparse": is_sparse}, f)
+
+
+class BallTreeIndex(ExactIndex):
+
+    kind = "ball_tree"
+
+    def __init__(self, leaf_size: int = 40, brute_force_rows: Optional[int] = 20000):
+        super().__init__(brute_force_rows)
+        self.leaf_size = leaf_size
+        self.tree = None
+        self.tree_positions = None
+        self.other_positions = None
+
+    def get_params(self) -> Dict[str, Any]:
+        return {"leaf_size": self.leaf_size, "brute_force_rows": self.brute_force_rows}
+
+    def build(self, vectors: np.ndarray) -> "BallTreeIndex":
+        self.vectors = vectors
+        norms = squared_norms(vectors)
+        on_sphere = np.isclose(norms, norms.max(), rtol=1e-5)
+
+        self.tree_positions = np.flatnonzero(on_sphere)
+        self.other_positions = np.flatnonzero(~on_sphere)
+        tree_vectors = vectors[self.tree_positions]
+        if sparse.issparse(tree_vectors):
+            tree_vectors = tree_vectors.toarray()
+        self.tree = BallTree(tree_vectors, leaf_size=self.leaf_size)
+        return self
+
+    def _extend_structure(self, start: int, vectors) -> None:
+        self.other_positions = np.concatenate([self.other_positions, np.arange(start, start + vectors.shape[0])])
+
+    def _search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k_tree = min(k, len(self.tree_positions))
+        _, neighbors = self.tree.query(query.reshape(1, -1), k=k_tree)
+        candidates = np.concatenate([self.tree_positions[neighbors[0]], self.other_positions])
+        return self._rank(candidates, query, k)
+
+    def _save_structure(self, directory: str) -> None:
+        joblib.dump((self.tree, self.tree_positions, self.other_positions), os.path.join(directory, "tree.joblib"))
+
+    def _load_structure(self, directory: str, mmap_mode: Optional[str]) -> None:
+        self.tree, self.tree_positions, self.other_positions = joblib.load(os.path.join(directory, "tree.joblib"))
+
+
+class IVFIndex(ExactIndex):
+
+    kind = "ivf"
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8, max_train_rows: int = 100000,
+                 random_state: int = 42, brute_force_rows: Optional[int] = 20000):
+        super().__init__(brute_force_rows)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.max_train_rows = max_train_rows
+        self.random_state = random_state
+        self.centroids = None
+        self.order = None
+        self.offsets = None
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "max_train_rows": self.max_train_rows,
+            "random_state": self.random_state,
+            "brute_force_rows": self.brute_force_rows
+        }
+
+    def build(self, vectors: np.ndarray) -> "IVFIndex":
+        self.vectors = vectors
+        n_lists = self.n_lists or max(1, int(np.sqrt(vectors.shape[0])))
+        n_lists = min(n_lists, vectors.shape[0])
+
+        rng = np.random.RandomState(self.random_state)
+        sample = vectors
+        if vectors.shape[0] > self.max_train_rows:
+            sample = vectors[rng.choice(vectors.shape[0], self.max_train_rows, replace=False)]
+
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, n_init=3, batch_size=4096, random_state=self.random_state)
+        kmeans.fit(sample)
+        labels = kmeans.predict(vectors)
+
+        self.n_lists = n_lists
+        self.centroids = kmeans.cluster_centers_.astype(vectors.dtype)
+        self._index_lists(labels)
+        return self
+
+    def _index_lists(self, labels: np.ndarray) -> None:
+        self.order = np.argsort(labels, kind='stable')
+        self.offsets = np.searchsorted(labels[self.order], np.arange(self.n_lists + 1))
+
+    def _extend_structure(self, start: int, vectors) -> None:
+        distances = squared_norms(self.centroids) - 2 * np.asarray(vectors @ self.centroids.T)
+        labels = np.empty(start + vectors.shape[0], dtype=np.int64)
+        labels[self.order] = np.repeat(np.arange(self.n_lists), np.diff(self.offsets))
+        labels[start:] = np.argmin(distances, axis=1)
+        self._index_lists(labels)
+
+    def _search(self, query: np.ndarray, k: int, n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        distances = squared_norms(self.centroids) - 2 * (self.centroids @ query)
+        lists = np.argpartition(distances, n_probe - 1)[:n_probe]
+
+        candidates = np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in lists])
+        return self._rank(candidates, query, k)
+
+    def _save_structure(self, directory: str) -> None:
+        for name in ("centroids", "order", "offsets"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    def _load_structure(self, directory: str, mmap_mode: Optional[str]) -> None:
+        for name in ("centroids", "order", "offsets"):
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode))
+
+
+INDEX_BACKENDS = {index_class.kind: index_class for index_class in (ExactIndex, BallTreeIndex, IVFIndex)}
+
+
+def build_index(kind: str, vectors: np.ndarray, **params) -> ExactIndex:
+    if kind not in INDEX_BACKENDS:
+        raise ValueError(f"Unknown neighbour index backend: {kind}")
+    return INDEX_BACKENDS[kind](**params).build(vectors)
+
+
+def load_index(directory: str, mmap_mode: Optional[str] = 'r') -> ExactIndex:
+    with open(os.path.join(directory, INDEX_META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+
+    index = INDEX_BACKENDS[meta["kind"]](**meta["params"])
+    if meta.get("sparse"):
+        index.vectors = sparse.load_npz(os.path.join(directory, SPARSE_VECTORS_FILE))
+    else:
+        index.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode=mmap_mode)
+    index._load_structure(directory, mmap_mode)
+    return index
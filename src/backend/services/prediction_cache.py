@@ -0,0 +1,64 @@
+import json
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from typing import Dict, Optional
+
+from src.backend.domain.models import LaptopSpecification, PricePrediction
+
+
+class PredictionCache:
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(laptop_spec: LaptopSpecification, model_version: str) -> str:
+        normalized = {}
+        for name, value in asdict(laptop_spec).items():
+            if isinstance(value, str):
+                value = value.strip()
+            elif isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                value = round(float(value), 6)
+            normalized[name] = value
+
+        payload = json.dumps([model_version, normalized], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[PricePrediction]:
+        with self._lock:
+            prediction = self._entries.get(key)
+            if prediction is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return replace(prediction)
+
+    def put(self, key: str, prediction: PricePrediction) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = replace(prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -1,116 +1,416 @@
-
+import os
+import shutil
+import threading
+import joblib
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Any, Optional, Tuple
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler, normalize
 
 from src.backend.domain.models import LaptopSpecification, RecommendedLaptop
 from src.backend.data.dataset import DatasetLoader
+from src.backend.services.neighbor_index import build_index, load_index
+from src.backend.services.text_index import TextIndex
+from src.backend.services.model_service import ModelService
+
+
+FEATURE_COLUMNS = ['screen_size', 'ram', 'weight']
+CATEGORY_COLUMNS = ['company', 'type', 'cpu', 'gpu', 'operating_system']
+TEXT_COLUMNS = ['company', 'cpu', 'gpu', 'product']
+CODE_COLUMNS = CATEGORY_COLUMNS + ['product']
+DEFAULT_FEATURE_WEIGHTS = {
+    'numeric': 1.0,
+    'company': 0.3,
+    'type': 0.3,
+    'cpu': 0.3,
+    'gpu': 0.3,
+    'operating_system': 0.2
+}
+MAX_APPEND_RATIO = 0.5
+SORT_OPTIONS = ('similarity', 'value')
+VALUE_CANDIDATE_FACTOR = 4
+RECORD_COLUMNS = ['company', 'product', 'type', 'screen_size', 'screen_resolution', 'cpu', 'ram', 'gpu',
+                  'operating_system', 'weight', 'memory', 'price_euros']
+INDEX_FORMAT_VERSION = 1
+CATALOG_INDEX_FILE = "catalog_index.joblib"
+NEIGHBORS_DIR = "neighbors"
 
 
 class RecommendationService:
-    
-    def __init__(self, dataset_loader: DatasetLoader = None):
+
+    def __init__(
+        self,
+        dataset_loader: DatasetLoader = None,
+        index_backend: str = "exact",
+        index_params: Optional[Dict[str, Any]] = None,
+        feature_weights: Optional[Dict[str, float]] = None,
+        model_service: Optional[ModelService] = None,
+        index_dir: Optional[str] = None
+    ):
+        unknown = set(feature_weights or {}) - set(DEFAULT_FEATURE_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown feature weights: {sorted(unknown)}")
+
         self.dataset_loader = dataset_loader or DatasetLoader()
+        self.feature_weights = {**DEFAULT_FEATURE_WEIGHTS, **(feature_weights or {})}
+        self.index_backend = index_backend
+        self.index_params = index_params or {}
         self.df = None
+        self.model_service = model_service
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._predictions_lock = threading.Lock()
+        self._index = None
         self._load_data()
-        
+
     def _load_data(self) -> None:
-        self.df = self.dataset_loader.load_data()
-    
-    def _compute_similarity(self, target_spec: LaptopSpecification) -> pd.DataFrame:
-        feature_cols = ['screen_size', 'ram', 'weight']
-        X = self.df[feature_cols].values
-
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-
-        target_features = np.array([
-            target_spec.screen_size,
-            target_spec.ram,
-            target_spec.weight
-        ]).reshape(1, -1)
-
-        target_scaled = scaler.transform(target_features)
-
-        similarity_scores = cosine_similarity(X_scaled, target_scaled).flatten()
-
-        df_with_scores = self.df.copy()
-        df_with_scores['similarity_score'] = similarity_scores
-
-        cat_bonus = 0.1
-        if target_spec.company in df_with_scores['company'].values:
-            df_with_scores.loc[df_with_scores['company'] == target_spec.company, 'similarity_score'] += cat_bonus
-            
-        if target_spec.type_name in df_with_scores['type'].values:
-            df_with_scores.loc[df_with_scores['type'] == target_spec.type_name, 'similarity_score'] += cat_bonus
-
-        df_with_scores = df_with_scores.sort_values(by='similarity_score', ascending=False)
-        
-        return df_with_scores
-    
+        if self.dataset_loader.df is None:
+            self.dataset_loader.load_data()
+        if self.index_dir is not None:
+            self._index = self._read_index(self.index_dir)
+        self.refresh()
+
+    def save_index(self, directory: str) -> None:
+        index = self._index
+        staging_dir = f"{directory}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        index["neighbors"].save(os.path.join(staging_dir, NEIGHBORS_DIR))
+        joblib.dump({
+            "format_version": INDEX_FORMAT_VERSION,
+            "feature_weights": self.feature_weights,
+            "raw": index["raw"],
+            "scaler": index["scaler"],
+            "categories": index["categories"],
+            "codes": index["codes"],
+            "text": index["text"]
+        }, os.path.join(staging_dir, CATALOG_INDEX_FILE))
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging_dir, directory)
+
+    def _read_index(self, directory: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(directory, CATALOG_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            saved = joblib.load(path)
+            neighbors = load_index(os.path.join(directory, NEIGHBORS_DIR))
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            print(f"Could not load recommendation index from {directory}: {e}")
+            return None
+
+        if saved.get("format_version") != INDEX_FORMAT_VERSION \
+                or saved["feature_weights"] != self.feature_weights or neighbors.kind != self.index_backend:
+            print(f"Recommendation index in {directory} was built with different settings, rebuilding")
+            return None
+
+        print(f"Loaded recommendation index for {len(saved['raw'])} laptops from {directory}")
+        return {
+            "raw": saved["raw"],
+            "scaler": saved["scaler"],
+            "categories": saved["categories"],
+            "codes": saved["codes"],
+            "text": saved["text"],
+            "neighbors": neighbors
+        }
+
+    @staticmethod
+    def _encode_categories(values: pd.Series, categories: Dict[Any, int]) -> np.ndarray:
+        codes, uniques = pd.factorize(values)
+        for value in uniques:
+            if value not in categories:
+                categories[value] = len(categories)
+
+        lookup = np.array([categories[value] for value in uniques] + [-1], dtype=np.int32)
+        return lookup[codes]
+
+    def refresh(self, dataset_loader: Optional[DatasetLoader] = None) -> None:
+        with self._lock:
+            if dataset_loader is not None:
+                self.dataset_loader = dataset_loader
+                if dataset_loader.df is None:
+                    dataset_loader.load_data()
+
+            df = self.dataset_loader.df
+            previous = self._index
+            raw = df[FEATURE_COLUMNS].to_numpy(dtype=float)
+
+            n_previous = len(previous["raw"]) if previous is not None else 0
+            reusable = previous is not None and len(df) >= n_previous \
+                and np.array_equal(raw[:n_previous], previous["raw"], equal_nan=True)
+
+            if reusable:
+                categories = {col: dict(previous["categories"][col]) for col in CODE_COLUMNS}
+                codes = {col: self._encode_categories(df[col], categories[col]) for col in CODE_COLUMNS}
+                reusable = len(df) - n_previous <= n_previous * MAX_APPEND_RATIO \
+                    and all(len(categories[col]) == len(previous["categories"][col]) for col in CATEGORY_COLUMNS) \
+                    and all(np.array_equal(codes[col][:n_previous], previous["codes"][col]) for col in CODE_COLUMNS)
+
+            changed = not reusable or len(df) > n_previous
+            if reusable:
+                scaler = previous["scaler"]
+                neighbors = previous["neighbors"]
+                text = previous["text"]
+                if len(df) > n_previous:
+                    new_codes = {col: codes[col][n_previous:] for col in CATEGORY_COLUMNS}
+                    new_vectors = self._embed(scaler.transform(raw[n_previous:]), new_codes, categories)
+                    neighbors = neighbors.extend(new_vectors)
+                    text = {col: text[col].extend(df[col].iloc[n_previous:]) for col in TEXT_COLUMNS}
+            else:
+                categories = {col: {} for col in CODE_COLUMNS}
+                codes = {col: self._encode_categories(df[col], categories[col]) for col in CODE_COLUMNS}
+                scaler = StandardScaler()
+                scaler.fit(raw)
+                vectors = self._embed(scaler.transform(raw), codes, categories)
+                neighbors = build_index(self.index_backend, vectors, **self.index_params)
+                text = {col: TextIndex(df[col]) for col in TEXT_COLUMNS}
+
+            price = df['price_euros'].to_numpy(dtype=float)
+            price_order = np.argsort(price, kind='stable')
+            ram = df['ram'].to_numpy(dtype=float)
+            self._index = {
+                "df": df,
+                "raw": raw,
+                "scaler": scaler,
+                "categories": categories,
+                "codes": codes,
+                "text": text,
+                "ram": ram,
+                "price": price,
+                "price_order": price_order,
+                "sorted_price": price[price_order],
+                "filter_options": {
+                    "company": sorted(text["company"].vocabulary.tolist()),
+                    "price": [float(np.nanmin(price)), float(np.nanmax(price))],
+                    "ram": sorted(np.unique(ram[~np.isnan(ram)]).astype(int).tolist())
+                },
+                "neighbors": neighbors,
+                "predictions": None
+            }
+            self.df = df
+            if changed and self.index_dir is not None:
+                self.save_index(self.index_dir)
+
+        self.refresh_predictions()
+
+    def _embed(
+        self,
+        features: np.ndarray,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, Dict[Any, int]]
+    ) -> sparse.csr_matrix:
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        unit = np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+
+        blocks = [sparse.csr_matrix((unit * self.feature_weights['numeric']).astype(np.float32))]
+        for col in CATEGORY_COLUMNS:
+            rows = np.flatnonzero(codes[col] >= 0)
+            values = np.full(len(rows), self.feature_weights[col], dtype=np.float32)
+            blocks.append(sparse.csr_matrix(
+                (values, (rows, codes[col][rows])),
+                shape=(len(features), len(categories[col]))
+            ))
+        return normalize(sparse.hstack(blocks, format='csr'), copy=False)
+
+    @staticmethod
+    def _price_band(index: Dict[str, Any], low: float, high: float) -> np.ndarray:
+        start = np.searchsorted(index["sorted_price"], low, side='left')
+        stop = np.searchsorted(index["sorted_price"], high, side='right')
+        return np.sort(index["price_order"][start:stop])
+
+    def _candidate_positions(
+        self,
+        index: Dict[str, Any],
+        filters: Optional[Dict[str, Any]],
+        price_bounds: Optional[Tuple[float, float]] = None
+    ) -> Optional[np.ndarray]:
+        filters = filters or {}
+        text = index["text"]
+        posting_lists = []
+        companies = filters.get('company')
+        if companies:
+            companies = [companies] if isinstance(companies, str) else list(companies)
+            posting_lists.append((text["company"], text["company"].exact(companies)))
+
+        for col in ('cpu', 'gpu', 'product'):
+            if filters.get(col):
+                posting_lists.append((text[col], text[col].match(filters[col])))
+
+        candidates = None
+        for text_index, codes in sorted(posting_lists, key=lambda item: item[0].size(item[1])):
+            positions = text_index.positions(codes)
+            candidates = positions if candidates is None else \
+                candidates[np.isin(candidates, positions, assume_unique=True)]
+
+        low, high = price_bounds or (-np.inf, np.inf)
+        if filters.get('price_min') is not None:
+            low = max(low, filters['price_min'])
+        if filters.get('price_max') is not None:
+            high = min(high, filters['price_max'])
+
+        if low > -np.inf or high < np.inf:
+            if candidates is None:
+                candidates = self._price_band(index, low, high)
+            else:
+                price = index["price"][candidates]
+                candidates = candidates[(price >= low) & (price <= high)]
+
+        if filters.get('ram_min') is not None:
+            if candidates is None:
+                candidates = np.flatnonzero(index["ram"] >= filters['ram_min'])
+            else:
+                candidates = candidates[index["ram"][candidates] >= filters['ram_min']]
+
+        return candidates
+
+    def _query_vectors(self, index: Dict[str, Any], target_specs: List[LaptopSpecification]) -> np.ndarray:
+        features = index["scaler"].transform(np.array([
+            [spec.screen_size, spec.ram, spec.weight] for spec in target_specs
+        ], dtype=float).reshape(-1, len(FEATURE_COLUMNS)))
+
+        targets = {
+            'company': [spec.company for spec in target_specs],
+            'type': [spec.type_name for spec in target_specs],
+            'cpu': [spec.cpu for spec in target_specs],
+            'gpu': [spec.gpu for spec in target_specs],
+            'operating_system': [spec.operating_system for spec in target_specs]
+        }
+        codes = {col: np.array([index["categories"][col].get(value, -1) for value in values], dtype=np.int32)
+                 for col, values in targets.items()}
+        return self._embed(features, codes, index["categories"]).toarray()
+
+    def _query_vector(self, index: Dict[str, Any], target_spec: LaptopSpecification) -> np.ndarray:
+        return self._query_vectors(index, [target_spec])[0]
+
+    @staticmethod
+    def _catalog_records(index: Dict[str, Any], positions: np.ndarray) -> Dict[int, Dict[str, Any]]:
+        positions = np.unique(positions)
+        records = index["df"].iloc[positions][RECORD_COLUMNS].to_dict('records')
+        return dict(zip(positions.tolist(), records))
+
+    def refresh_predictions(self, version: Optional[str] = None) -> None:
+        if self.model_service is None or self.model_service.model_version is None:
+            return
+
+        with self._predictions_lock:
+            index = self._index
+            cached = index["predictions"]
+            if cached is not None and cached["version"] == self.model_service.model_version:
+                return
+            predicted_version, values = self.model_service.predict_catalog(index["df"])
+            index["predictions"] = {"version": predicted_version, "values": values}
+
+    def _catalog_predictions(self, index: Dict[str, Any]) -> Optional[np.ndarray]:
+        cached = index["predictions"]
+        if cached is None or self.model_service is None or cached["version"] != self.model_service.model_version:
+            return None
+        return cached["values"]
+
+    @staticmethod
+    def _to_recommendation(row: Dict[str, Any], score: float, predicted_price: Optional[float] = None) -> RecommendedLaptop:
+        spec = LaptopSpecification(
+            company=row['company'],
+            product=row['product'],
+            type_name=row['type'],
+            screen_size=round(float(row['screen_size']), 2),
+            screen_resolution=row['screen_resolution'],
+            cpu=row['cpu'],
+            ram=int(row['ram']),
+            gpu=row['gpu'],
+            operating_system=row['operating_system'],
+            weight=round(float(row['weight']), 3),
+            memory=row['memory']
+        )
+
+        value_score = None
+        if predicted_price is not None and predicted_price > 0:
+            value_score = (predicted_price - float(row['price_euros'])) / predicted_price
+
+        return RecommendedLaptop(
+            company=row['company'],
+            product=row['product'],
+            specifications=spec,
+            actual_price=float(row['price_euros']),
+            similarity_score=float(score),
+            predicted_price=predicted_price,
+            value_score=value_score
+        )
+
+    def _to_recommendations(
+        self,
+        index: Dict[str, Any],
+        positions: List[int],
+        scores: np.ndarray,
+        records: Dict[int, Dict[str, Any]]
+    ) -> List[RecommendedLaptop]:
+        predictions = self._catalog_predictions(index)
+        return [
+            self._to_recommendation(
+                records[position],
+                score,
+                float(predictions[position]) if predictions is not None else None
+            )
+            for position, score in zip(positions, scores)
+        ]
+
+    def get_filter_options(self) -> Dict[str, List[Any]]:
+        return self._index["filter_options"]
+
+    def suggest(self, column: str, query: str, limit: int = 10) -> List[str]:
+        return self._index["text"][column].suggest(query, limit)
+
     def get_similar_laptops(
-        self, 
-        target_spec: LaptopSpecification, 
+        self,
+        target_spec: LaptopSpecification,
         price_range: float = 0.2,
-        limit: int = 5
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        target_price: Optional[float] = None,
+        sort_by: str = "similarity"
     ) -> List[RecommendedLaptop]:
 
-        df_similar = self._compute_similarity(target_spec)
-        recommendations = []
-        for _, row in df_similar.head(limit).iterrows():
-            spec = LaptopSpecification(
-                company=row['company'],
-                product=row['product'],
-                type_name=row['type'],
-                screen_size=row['screen_size'],
-                screen_resolution=row['screen_resolution'],
-                cpu=row['cpu'],
-                ram=row['ram'],
-                gpu=row['gpu'],
-                operating_system=row['operating_system'],
-                weight=row['weight']
-            )
-            
-            recommendation = RecommendedLaptop(
-                company=row['company'],
-                product=row['product'],
-                specifications=spec,
-                actual_price=row['price_euros'],
-                similarity_score=row['similarity_score']
-            )
-            
-            recommendations.append(recommendation)
-        
-        return recommendations
-    
-    def filter_recommendations(
-        self, 
-        recommendations: List[RecommendedLaptop], 
-        filters: Dict[str, Any]
-    ) -> List[RecommendedLaptop]:
+        if sort_by not in SORT_OPTIONS:
+            raise ValueError(f"Unknown recommendation ordering: {sort_by}")
+
+        index = self._index
+        price_bounds = None
+        if target_price is not None and price_range is not None:
+            price_bounds = (target_price * (1 - price_range), target_price * (1 + price_range))
+
+        candidates = self._candidate_positions(index, filters, price_bounds)
+        if candidates is not None and len(candidates) == 0:
+            return []
+
+        fetch = limit * VALUE_CANDIDATE_FACTOR if sort_by == "value" else limit
+        positions, scores = index["neighbors"].search(self._query_vector(index, target_spec), fetch, candidates)
+
+        records = self._catalog_records(index, positions)
+        recommendations = self._to_recommendations(index, positions.tolist(), scores, records)
+        if sort_by == "value":
+            recommendations.sort(key=lambda r: r.value_score if r.value_score is not None else -np.inf, reverse=True)
+        return recommendations[:limit]
+
+    def get_similar_laptops_batch(
+        self,
+        target_specs: List[LaptopSpecification],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[RecommendedLaptop]]:
+
+        index = self._index
+        candidates = self._candidate_positions(index, filters)
+        if not target_specs or (candidates is not None and len(candidates) == 0):
+            return [[] for _ in target_specs]
+
+        queries = self._query_vectors(index, target_specs)
+        positions, scores = index["neighbors"].search_batch(queries, k, candidates)
 
-        filtered_recommendations = recommendations.copy()
-
-        if filters.get('company'):
-            filtered_recommendations = [r for r in filtered_recommendations 
-                                       if r.company == filters['company']]
-            
-        if filters.get('cpu'):
-            filtered_recommendations = [r for r in filtered_recommendations 
-                                       if filters['cpu'].lower() in r.specifications.cpu.lower()]
-            
-        if filters.get('gpu'):
-            filtered_recommendations = [r for r in filtered_recommendations 
-                                       if filters['gpu'].lower() in r.specifications.gpu.lower()]
-            
-        if filters.get('ram_min'):
-            filtered_recommendations = [r for r in filtered_recommendations 
-                                       if r.specifications.ram >= filters['ram_min']]
-            
-        if filters.get('price_max'):
-            filtered_recommendations = [r for r in filtered_recommendations 
-                                       if r.actual_price <= filters['price_max']]
-            
-        return filtered_recommendations
+        records = self._catalog_records(index, positions)
+        return [
+            self._to_recommendations(index, row_positions, row_scores, records)
+            for row_positions, row_scores in zip(positions.tolist(), scores)
+        ]
@@ -0,0 +1,107 @@
+import os
+import threading
+from typing import Dict, Any, Optional
+
+from src.backend.data.dataset import DatasetLoader
+from src.backend.services.model_service import ModelService
+from src.backend.services.recommendation_service import RecommendationService
+from src.backend.services.currency_service import CurrencyService
+from src.backend.services.training_service import TrainingService
+
+
+RECOMMENDATION_INDEX_DIR = "recommendation_index"
+
+
+class ServiceRegistry:
+
+    def __init__(
+        self,
+        model_dir: str = "/tmp",
+        data_path: Optional[str] = None,
+        model_load_mode: str = "mmap",
+        training_jobs: Optional[int] = None
+    ):
+        self.model_dir = model_dir
+        self.data_path = data_path
+        self.model_load_mode = model_load_mode
+        self.training_jobs = training_jobs
+        self._lock = threading.RLock()
+        self._services = None
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._services is not None
+
+    def get_services(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._services is None:
+                self._services = self._build_services()
+            return self._services
+
+    def _build_services(self) -> Dict[str, Any]:
+        model_service = ModelService(
+            model_dir=self.model_dir,
+            dataset_loader=DatasetLoader(self.data_path),
+            load_mode=self.model_load_mode,
+            training_jobs=self.training_jobs
+        )
+        training_service = TrainingService(model_service)
+        model_loaded = model_service.load_model()
+
+        dataset_loader = DatasetLoader(self.data_path)
+        dataset_loader.load_data()
+
+        recommendation_service = RecommendationService(
+            dataset_loader,
+            model_service=model_service,
+            index_dir=os.path.join(self.model_dir, RECOMMENDATION_INDEX_DIR)
+        )
+        model_service.add_model_listener(recommendation_service.refresh_predictions)
+        if not model_loaded:
+            training_service.start()
+
+        return {
+            "dataset_loader": dataset_loader,
+            "model_service": model_service,
+            "training_service": training_service,
+            "recommendation_service": recommendation_service,
+            "currency_service": CurrencyService()
+        }
+
+    def get_training_status(self) -> Dict[str, Any]:
+        return self.get_services()["training_service"].get_status()
+
+    def reload_data(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._services is None:
+                return self.get_services()
+
+            dataset_loader = DatasetLoader(self.data_path)
+            dataset_loader.load_data()
+
+            self._services["recommendation_service"].refresh(dataset_loader)
+            self._services = {
+                **self._services,
+                "dataset_loader": dataset_loader
+            }
+            return self._services
+
+    def reload_model(self) -> bool:
+        with self._lock:
+            if self._services is None:
+                self.get_services()
+                return True
+            return self._services["model_service"].load_model()
+
+    def rollback_model(self) -> Optional[str]:
+        with self._lock:
+            return self.get_services()["model_service"].rollback_model()
+
+    def retrain(self, **search_kwargs) -> bool:
+        return self.get_services()["training_service"].start(**search_kwargs)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._services is not None:
+                self._services["training_service"].wait()
+            self._services = None
@@ -0,0 +1,110 @@
+import copy
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List
+
+
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TextIndex:
+
+    def __init__(self, values: pd.Series, n: int = NGRAM_SIZE):
+        self.n = n
+        self.vocabulary = pd.Series([], dtype=object)
+        self.lowered = pd.Series([], dtype=object)
+        self.lookup = {}
+        self.postings = {}
+        self._index_rows(self._encode(values))
+
+    def _encode(self, values: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+
+        new_values = [value for value in uniques if value not in self.lookup]
+        if new_values:
+            first_code = len(self.vocabulary)
+            added = pd.Series(new_values, dtype=object)
+            self.vocabulary = pd.concat([self.vocabulary, added], ignore_index=True)
+            self.lowered = pd.concat([self.lowered, added.astype(str).str.lower()], ignore_index=True)
+
+            grams: Dict[str, List[int]] = {}
+            for code, value in enumerate(new_values, start=first_code):
+                self.lookup[value] = code
+                for gram in _ngrams(self.lowered.iloc[code], self.n):
+                    grams.setdefault(gram, []).append(code)
+
+            postings = dict(self.postings)
+            for gram, found in grams.items():
+                added_codes = np.array(found, dtype=np.int32)
+                postings[gram] = np.concatenate([postings[gram], added_codes]) if gram in postings else added_codes
+            self.postings = postings
+
+        lookup = np.array([self.lookup[value] for value in uniques] + [-1], dtype=np.int32)
+        return lookup[codes]
+
+    def _row_codes(self) -> np.ndarray:
+        codes = np.full(len(self.order), -1, dtype=np.int32)
+        codes[self.order[self.offsets[0]:]] = np.repeat(np.arange(len(self.counts), dtype=np.int32), self.counts)
+        return codes
+
+    def _index_rows(self, codes: np.ndarray) -> None:
+        self.order = np.argsort(codes, kind='stable')
+        self.offsets = np.searchsorted(codes[self.order], np.arange(len(self.vocabulary) + 1))
+        self.counts = np.diff(self.offsets)
+
+    def extend(self, values: pd.Series) -> "TextIndex":
+        extended = copy.copy(self)
+        extended.lookup = dict(self.lookup)
+        codes = extended._encode(values)
+        extended._index_rows(np.concatenate([self._row_codes(), codes]))
+        return extended
+
+    def exact(self, values: Iterable) -> np.ndarray:
+        found = [self.lookup[value] for value in values if value in self.lookup]
+        return np.unique(np.array(found, dtype=np.int32))
+
+    def match(self, query: str) -> np.ndarray:
+        query = query.strip().lower()
+        if not query:
+            return np.arange(len(self.vocabulary), dtype=np.int32)
+
+        if len(query) < self.n:
+            return np.flatnonzero(self.lowered.str.contains(query, regex=False).to_numpy()).astype(np.int32)
+
+        grams = sorted(_ngrams(query, self.n), key=lambda gram: len(self.postings.get(gram, ())))
+        codes = self.postings.get(grams[0])
+        if codes is None:
+            return np.empty(0, dtype=np.int32)
+        for gram in grams[1:]:
+            codes = np.intersect1d(codes, self.postings[gram], assume_unique=True)
+            if len(codes) == 0:
+                return codes
+
+        if len(query) > self.n:
+            lowered = self.lowered.to_numpy()
+            codes = codes[[query in lowered[code] for code in codes]]
+        return codes
+
+    def size(self, codes: np.ndarray) -> int:
+        return int(self.counts[codes].sum())
+
+    def positions(self, codes: np.ndarray) -> np.ndarray:
+        slices = [self.order[self.offsets[code]:self.offsets[code + 1]] for code in codes]
+        if not slices:
+            return np.empty(0, dtype=int)
+        return np.sort(np.concatenate(slices))
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        codes = self.match(query)
+        if len(codes) == 0:
+            return []
+
+        prefix = self.lowered.to_numpy()[codes].astype(str)
+        prefix = np.char.startswith(prefix, query.strip().lower())
+        ranked = codes[np.lexsort((codes, -self.counts[codes], ~prefix))]
+        return self.vocabulary.iloc[ranked[:limit]].tolist()
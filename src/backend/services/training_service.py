@@ -0,0 +1,120 @@
+import threading
+import time
+import numpy as np
+from typing import Dict, Any, Optional
+
+from src.backend.services.model_service import ModelService, DEFAULT_MAX_R2_DROP
+
+
+class TrainingService:
+
+    def __init__(self, model_service: ModelService, min_r2: float = 0.0, max_r2_drop: float = DEFAULT_MAX_R2_DROP):
+        self.model_service = model_service
+        self.min_r2 = min_r2
+        self.max_r2_drop = max_r2_drop
+        self._lock = threading.Lock()
+        self._thread = None
+        self._status = {
+            "state": "idle",
+            "message": "No retraining in progress",
+            "progress": None,
+            "model_info": None,
+            "error": None,
+            "started_at": None,
+            "finished_at": None
+        }
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._status)
+
+    def _update_status(self, **changes) -> None:
+        with self._lock:
+            self._status.update(changes)
+
+    def start(self, **search_kwargs) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+
+            self._status.update({
+                "state": "running",
+                "message": "Training started",
+                "progress": None,
+                "model_info": None,
+                "error": None,
+                "started_at": time.time(),
+                "finished_at": None
+            })
+            self._thread = threading.Thread(
+                target=self._run,
+                kwargs=search_kwargs,
+                name="model-training",
+                daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running()
+
+    def _on_progress(self, progress: Dict[str, Any]) -> None:
+        self._update_status(
+            progress=progress,
+            message=f"Searching {progress['family']} ({progress['stage']}, {progress['fits']} fits)"
+        )
+
+    def _validate(self, model_info: Dict[str, Any]) -> Optional[str]:
+        if model_info.get("model") is None:
+            return "Search did not produce a model"
+        if not np.isfinite(model_info["r2"]):
+            return "Validation R² is not finite"
+        if model_info["r2"] < self.min_r2:
+            return f"Validation R² {model_info['r2']:.4f} is below the required {self.min_r2:.4f}"
+        baseline_r2 = model_info.get("baseline_r2")
+        if baseline_r2 is not None and model_info["r2"] < baseline_r2 - self.max_r2_drop:
+            return f"Updated model R² {model_info['r2']:.4f} is worse than the current {baseline_r2:.4f}"
+        return None
+
+    def _run(self, incremental: bool = False, **search_kwargs) -> None:
+        try:
+            model_info = None
+            if incremental:
+                self._update_status(message="Updating model with appended rows")
+                model_info = self.model_service.update_model(publish=False)
+                if model_info is None:
+                    print("Incremental update not possible, running a full search")
+
+            if model_info is None:
+                model_info = self.model_service.find_best_model(
+                    progress_callback=self._on_progress,
+                    publish=False,
+                    **search_kwargs
+                )
+
+            error = self._validate(model_info)
+            if error:
+                self._update_status(state="rejected", message=error, error=error, finished_at=time.time())
+                return
+
+            self.model_service.publish_model(model_info)
+            self._update_status(
+                state="completed",
+                message=f"Serving {model_info['model_type']} (R²: {model_info['r2']:.4f})",
+                model_info={
+                    "model_type": model_info["model_type"],
+                    "params": model_info.get("params"),
+                    "rmse": model_info["rmse"],
+                    "r2": model_info["r2"]
+                },
+                finished_at=time.time()
+            )
+        except Exception as e:
+            print(f"Error training model: {e}")
+            self._update_status(state="failed", message=f"Training failed: {e}", error=str(e), finished_at=time.time())
@@ -0,0 +1,194 @@
+import os
+import json
+import numpy as np
+from typing import Any, Dict, List, Optional
+from sklearn.ensemble import GradientBoostingRegressor
+
+
+TREE_LEAF = -1
+ENSEMBLE_ARRAYS = ("feature", "threshold", "children_left", "children_right", "value", "roots")
+ENSEMBLE_META_FILE = "ensemble.json"
+
+
+class FlatTreeEnsemble:
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        n_features: int,
+        estimator: str,
+        aggregation: str = "mean",
+        init: float = 0.0,
+        scale: float = 1.0,
+        chunk_size: int = 4096
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+        self.estimator = estimator
+        self.aggregation = aggregation
+        self.init = init
+        self.scale = scale
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def is_forest(model: Any) -> bool:
+        estimators = getattr(model, 'estimators_', None)
+        return isinstance(estimators, list) and all(hasattr(tree, 'tree_') for tree in estimators)
+
+    @staticmethod
+    def is_boosting(model: Any) -> bool:
+        return isinstance(model, GradientBoostingRegressor) and hasattr(model, 'estimators_')
+
+    @classmethod
+    def supports(cls, model: Any) -> bool:
+        return cls.is_forest(model) or cls.is_boosting(model)
+
+    @classmethod
+    def from_estimator(cls, model: Any) -> "FlatTreeEnsemble":
+        if cls.is_forest(model):
+            return cls._from_trees(model, [estimator.tree_ for estimator in model.estimators_], "mean")
+
+        if cls.is_boosting(model):
+            if model.init_ == "zero":
+                init = 0.0
+            else:
+                init = float(np.ravel(model.init_.predict(np.zeros((1, model.n_features_in_))))[0])
+            trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+            return cls._from_trees(model, trees, "sum", init=init, scale=float(model.learning_rate))
+
+        raise ValueError(f"Cannot export {type(model).__name__} to a flat tree ensemble")
+
+    @classmethod
+    def _from_trees(
+        cls,
+        model: Any,
+        trees: List[Any],
+        aggregation: str,
+        init: float = 0.0,
+        scale: float = 1.0
+    ) -> "FlatTreeEnsemble":
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+        def shift_children(children: np.ndarray, offset: int) -> np.ndarray:
+            return np.where(children == TREE_LEAF, TREE_LEAF, children + offset)
+
+        return cls(
+            feature=np.concatenate([tree.feature for tree in trees]).astype(np.int32),
+            threshold=np.concatenate([tree.threshold for tree in trees]).astype(np.float64),
+            children_left=np.concatenate([
+                shift_children(tree.children_left, offset) for tree, offset in zip(trees, offsets)
+            ]).astype(np.int32),
+            children_right=np.concatenate([
+                shift_children(tree.children_right, offset) for tree, offset in zip(trees, offsets)
+            ]).astype(np.int32),
+            value=np.concatenate([tree.value[:, 0, 0] for tree in trees]).astype(np.float64),
+            roots=offsets[:-1].astype(np.int64),
+            n_features=int(model.n_features_in_),
+            estimator=type(model).__name__,
+            aggregation=aggregation,
+            init=init,
+            scale=scale
+        )
+
+    def verify(self, model: Any, X: np.ndarray) -> float:
+        return float(np.max(np.abs(self.predict(X) - model.predict(X)), initial=0.0))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def supports_tree_intervals(self) -> bool:
+        return self.aggregation == "mean"
+
+    def save(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        for name in ENSEMBLE_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+
+        with open(os.path.join(directory, ENSEMBLE_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                "n_features": self.n_features,
+                "estimator": self.estimator,
+                "aggregation": self.aggregation,
+                "init": self.init,
+                "scale": self.scale
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = 'r') -> "FlatTreeEnsemble":
+        with open(os.path.join(directory, ENSEMBLE_META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ENSEMBLE_ARRAYS
+        }
+        return cls(
+            n_features=meta["n_features"],
+            estimator=meta["estimator"],
+            aggregation=meta.get("aggregation", "mean"),
+            init=meta.get("init", 0.0),
+            scale=meta.get("scale", 1.0),
+            **arrays
+        )
+
+    def predict_per_tree(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected input with {self.n_features} features, got shape {X.shape}")
+
+        predictions = np.empty((self.n_trees, X.shape[0]))
+        for start in range(0, X.shape[0], self.chunk_size):
+            X_chunk = X[start:start + self.chunk_size]
+            predictions[:, start:start + len(X_chunk)] = self._leaf_values(X_chunk)
+        return predictions
+
+    def _leaf_values(self, X: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        X_flat = X.ravel()
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.intp), n_rows)
+        row_offsets = np.tile(np.arange(n_rows, dtype=np.intp) * X.shape[1], self.n_trees)
+
+        active = np.flatnonzero(self.children_left.take(nodes) != TREE_LEAF)
+        while active.size:
+            current = nodes.take(active)
+            go_left = X_flat.take(row_offsets.take(active) + self.feature.take(current)) <= self.threshold.take(current)
+            next_nodes = np.where(go_left, self.children_left.take(current), self.children_right.take(current))
+            nodes[active] = next_nodes
+            active = active[self.children_left.take(next_nodes) != TREE_LEAF]
+
+        return self.value.take(nodes).reshape(self.n_trees, n_rows)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        per_tree = self.predict_per_tree(X)
+
+        if self.aggregation == "sum":
+            predictions = np.full(per_tree.shape[1], self.init)
+            for tree_output in per_tree:
+                predictions += self.scale * tree_output
+            return predictions
+
+        predictions = np.zeros(per_tree.shape[1])
+        for tree_output in per_tree:
+            predictions += tree_output
+        return predictions / self.n_trees
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "estimator": self.estimator,
+            "aggregation": self.aggregation,
+            "n_trees": self.n_trees,
+            "n_nodes": int(len(self.feature)),
+            "nbytes": int(sum(getattr(self, name).nbytes for name in ENSEMBLE_ARRAYS))
+        }
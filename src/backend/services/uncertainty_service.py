@@ -0,0 +1,88 @@
+import numpy as np
+from typing import Optional, Tuple, Any
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+
+from src.backend.services.tree_inference import FlatTreeEnsemble
+
+
+class UncertaintyEstimator:
+
+    def __init__(
+        self,
+        lower_quantile: float = 0.025,
+        upper_quantile: float = 0.975,
+        n_jobs: Optional[int] = -1,
+        parallel_threshold: int = 1000
+    ):
+        self.lower_quantile = lower_quantile
+        self.upper_quantile = upper_quantile
+        self.n_jobs = n_jobs
+        self.parallel_threshold = parallel_threshold
+        self.interval_models = None
+
+    def fit(self, model: Any, X_train: np.ndarray, y_train: np.ndarray) -> None:
+        self.interval_models = None
+
+        if isinstance(model, (GradientBoostingRegressor, HistGradientBoostingRegressor)):
+            self.interval_models = (
+                self._fit_quantile_model(model, self.lower_quantile, X_train, y_train),
+                self._fit_quantile_model(model, self.upper_quantile, X_train, y_train)
+            )
+
+    @staticmethod
+    def _fit_quantile_model(model: Any, quantile: float, X_train: np.ndarray, y_train: np.ndarray) -> Any:
+        if isinstance(model, HistGradientBoostingRegressor):
+            quantile_model = clone(model).set_params(loss="quantile", quantile=quantile)
+        else:
+            quantile_model = clone(model).set_params(loss="quantile", alpha=quantile)
+        quantile_model.fit(X_train, y_train)
+        return quantile_model
+
+    def set_interval_models(self, interval_models: Optional[Tuple[Any, Any]]) -> None:
+        self.interval_models = interval_models
+
+    @staticmethod
+    def is_flat_forest(model: Any) -> bool:
+        return hasattr(model, 'predict_per_tree') and model.supports_tree_intervals
+
+    def supports(self, model: Any) -> bool:
+        return self.interval_models is not None or FlatTreeEnsemble.is_forest(model) or self.is_flat_forest(model)
+
+    def per_tree_predictions(self, model: Any, X: np.ndarray) -> np.ndarray:
+        if self.is_flat_forest(model):
+            return model.predict_per_tree(X)
+
+        X_tree = np.ascontiguousarray(X, dtype=np.float32)
+        predictions = np.empty((len(model.estimators_), X_tree.shape[0]))
+
+        def predict_tree(i, tree):
+            predictions[i] = tree.tree_.predict(X_tree).reshape(X_tree.shape[0], -1)[:, 0]
+
+        if self.n_jobs == 1 or X_tree.shape[0] < self.parallel_threshold:
+            for i, tree in enumerate(model.estimators_):
+                predict_tree(i, tree)
+        else:
+            Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(predict_tree)(i, tree) for i, tree in enumerate(model.estimators_)
+            )
+
+        return predictions
+
+    def predict_intervals(self, model: Any, X: np.ndarray) -> Optional[np.ndarray]:
+        if self.interval_models is not None:
+            lower_model, upper_model = self.interval_models
+            lower = lower_model.predict(X)
+            upper = upper_model.predict(X)
+            return np.column_stack([np.minimum(lower, upper), np.maximum(lower, upper)])
+
+        if FlatTreeEnsemble.is_forest(model) or self.is_flat_forest(model):
+            predictions = self.per_tree_predictions(model, X)
+            return np.percentile(
+                predictions,
+                [self.lower_quantile * 100, self.upper_quantile * 100],
+                axis=0
+            ).T
+
+        return None
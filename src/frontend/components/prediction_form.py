@@ -25,7 +25,7 @@ def render_prediction_form(df: pd.DataFrame) -> Optional[LaptopSpecification]:
 
                         if numeric:
                             try:
-                                return list(sorted([float(x) if isinstance(x, (int, float, str)) else x for x in values]))
+                                return list(sorted([round(float(x), 3) if isinstance(x, (int, float, str)) else x for x in values]))
                             except (ValueError, TypeError):
                                 return sorted(values)
                         else:
@@ -93,6 +93,9 @@ def render_prediction_form(df: pd.DataFrame) -> Optional[LaptopSpecification]:
             operating_systems = safe_get_options('operating_system')
             operating_system = st.selectbox("Operating System", operating_systems)
 
+            storage_options = safe_get_options('memory', "256GB SSD")
+            memory = st.selectbox("Storage", storage_options)
+
             try:
                 weights = safe_get_options('weight', [1.0, 3.0], numeric=True)
                 min_weight = min(weights)
@@ -123,7 +126,8 @@ def render_prediction_form(df: pd.DataFrame) -> Optional[LaptopSpecification]:
                 ram=ram,
                 gpu=gpu,
                 operating_system=operating_system,
-                weight=weight
+                weight=weight,
+                memory=memory
             )
 
         if submitted:
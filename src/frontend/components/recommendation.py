@@ -1,38 +1,76 @@
 
 import streamlit as st
-from typing import List
+from typing import Optional
 
-from src.backend.domain.models import RecommendedLaptop
+from src.backend.domain.models import LaptopSpecification
+from src.backend.services.recommendation_service import RecommendationService
 
 
-def render_recommendations(recommendations: List[RecommendedLaptop], currency: str):
+def _typeahead(recommendation_service: RecommendationService, label: str, column: str) -> str:
+    query = st.text_input(f"{label} contains", value="", key=f"{column}_query").strip()
+    if not query:
+        return ""
+
+    suggestions = [s for s in recommendation_service.suggest(column, query, limit=8) if s != query]
+    if not suggestions:
+        return query
+
+    return st.selectbox(f"Matching {label}", [query] + suggestions, key=f"{column}_suggestion",
+                        format_func=lambda option: f"Any containing '{option}'" if option == query else option)
+
+
+def render_recommendations(
+    recommendation_service: RecommendationService,
+    laptop_spec: LaptopSpecification,
+    currency: str,
+    target_price: Optional[float] = None,
+    conversion_rate: float = 1.0,
+    limit: int = 3
+):
 
     st.subheader("Similar Laptops You Might Like")
-    
-    if not recommendations:
-        st.info("No recommendations found.")
-        return
+
+    options = recommendation_service.get_filter_options()
 
     st.write("Filter recommendations:")
     col1, col2, col3 = st.columns(3)
     
     with col1:
         min_price = st.number_input("Min Price", value=0.0, step=100.0)
+        cpu_filter = _typeahead(recommendation_service, "CPU", "cpu")
     
     with col2:
-        max_price = st.number_input("Max Price", value=5000.0, step=100.0)
+        max_price = st.number_input("Max Price", value=max(5000.0, options["price"][1]), step=100.0)
+        gpu_filter = _typeahead(recommendation_service, "GPU", "gpu")
     
     with col3:
-        filter_company = st.multiselect("Companies", 
-                                       list(set(r.company for r in recommendations)),
-                                       default=[])
+        filter_company = st.multiselect("Companies", options["company"], default=[])
+        ram_min = st.selectbox("Min RAM (GB)", [0] + options["ram"])
+        product_filter = _typeahead(recommendation_service, "Model", "product")
+
+    sort_label = st.radio("Sort by", ["Similarity", "Value for money"], horizontal=True)
 
-    filtered_recommendations = [
-        r for r in recommendations
-        if r.actual_price >= min_price
-        and r.actual_price <= max_price
-        and (not filter_company or r.company in filter_company)
-    ]
+    price_range = None
+    if target_price is not None:
+        price_range = st.slider("Price band around prediction (±%)", min_value=5, max_value=100, value=20, step=5) / 100
+
+    filters = {
+        "price_min": min_price if min_price > 0 else None,
+        "price_max": max_price,
+        "company": filter_company,
+        "cpu": cpu_filter,
+        "gpu": gpu_filter,
+        "product": product_filter,
+        "ram_min": ram_min or None
+    }
+    filtered_recommendations = recommendation_service.get_similar_laptops(
+        laptop_spec,
+        price_range=price_range,
+        limit=limit,
+        filters=filters,
+        target_price=target_price,
+        sort_by="value" if sort_label == "Value for money" else "similarity"
+    )
 
     if not filtered_recommendations:
         st.warning("No laptops match your filters.")
@@ -40,13 +78,20 @@ def render_recommendations(recommendations: List[RecommendedLaptop], currency: s
 
     cols = st.columns(min(3, len(filtered_recommendations)))
     
-    for i, laptop in enumerate(filtered_recommendations[:3]):  # Show top 3
+    for i, laptop in enumerate(filtered_recommendations):
+        value_note = ""
+        if laptop.value_score is not None:
+            direction = "below" if laptop.value_score >= 0 else "above"
+            value_note = (f"<p>Model estimate: {currency} {laptop.predicted_price * conversion_rate:.2f} "
+                          f"({abs(laptop.value_score) * 100:.0f}% {direction})</p>")
+
         with cols[i % 3]:
             st.markdown(f"""
             <div style="border: 1px solid #e0e0e0; border-radius: 5px; padding: 10px; margin: 5px;">
                 <h4>{laptop.company} {laptop.product}</h4>
                 <p><strong>{currency} {laptop.actual_price:.2f}</strong></p>
                 <p>Similarity: {int(laptop.similarity_score * 100)}%</p>
+                {value_note}
                 <p><strong>Specs:</strong><br>
                 CPU: {laptop.specifications.cpu}<br>
                 RAM: {laptop.specifications.ram} GB<br>
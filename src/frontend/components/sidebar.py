@@ -1,9 +1,12 @@
 
 import streamlit as st
+from typing import Optional
+
 from src.backend.services.currency_service import CurrencyService
+from src.backend.services.training_service import TrainingService
 
 
-def render_sidebar(currency_service: CurrencyService):
+def render_sidebar(currency_service: CurrencyService, training_service: Optional[TrainingService] = None):
 
     st.sidebar.title("LapiMate")
     st.sidebar.image("https://img.icons8.com/color/96/000000/laptop--v1.png", width=100)
@@ -30,6 +33,17 @@ def render_sidebar(currency_service: CurrencyService):
         currencies,
         index=currencies.index(st.session_state.current_currency)
     )
-    
+
+    if training_service is not None:
+        st.sidebar.markdown("---")
+        st.sidebar.header("Model")
+        training_status = training_service.get_status()
+        st.sidebar.caption(training_status["message"])
+
+        def retrain_callback():
+            training_service.start(incremental=True)
+
+        st.sidebar.button("Retrain model", on_click=retrain_callback, key="retrain_model_btn",
+                          disabled=training_service.is_running())
 
     return selected_page, selected_currency
@@ -5,10 +5,7 @@ from typing import Dict, Any
 import os
 
 from src.backend.domain.models import LaptopSpecification, PricePrediction
-from src.backend.data.dataset import DatasetLoader
-from src.backend.services.model_service import ModelService
-from src.backend.services.recommendation_service import RecommendationService
-from src.backend.services.currency_service import CurrencyService
+from src.backend.services.service_registry import ServiceRegistry
 
 from src.frontend.components.sidebar import render_sidebar
 from src.frontend.components.prediction_form import render_prediction_form
@@ -18,45 +15,34 @@ from src.frontend.components.recommendation import render_recommendations
 from src.frontend.components.comparison import render_comparison
 
 
+@st.cache_resource
+def get_service_registry() -> ServiceRegistry:
+    return ServiceRegistry(model_dir='/tmp')
+
+
 def initialize_services():
-    model_dir = '/tmp'
+    registry = get_service_registry()
 
-    if "dataset_loader" not in st.session_state:
-        dataset_loader = DatasetLoader()
-        df = dataset_loader.load_data()
-        dataset_loader.prepare_train_test_data()
-        st.session_state["dataset_loader"] = dataset_loader
+    if registry.is_initialized:
+        services = registry.get_services()
     else:
-        dataset_loader = st.session_state["dataset_loader"]
-
-    if "model_service" not in st.session_state:
-        model_service = ModelService(model_dir=model_dir, dataset_loader=dataset_loader)
-
-        if model_service.load_model():
-            st.session_state["model_trained"] = True
-        else:
-            with st.spinner("Training new model... This may take a moment..."):
-                try:
-                    model_info = model_service.find_best_model()
-                    st.success(f"Model trained successfully! {model_info['model_type']} (R²: {model_info['r2']:.4f})")
-                    st.session_state["model_info"] = model_info
-                except Exception as e:
-                    st.error(f"Error training model: {str(e)}")
-                    st.session_state["training_error"] = str(e)
-        
-        st.session_state["model_service"] = model_service
-    else:
-        model_service = st.session_state["model_service"]
+        with st.spinner("Loading data and model... This may take a moment..."):
+            services = registry.get_services()
 
-    recommendation_service = RecommendationService(dataset_loader)
-    currency_service = CurrencyService()
-    
-    return {
-        "dataset_loader": dataset_loader,
-        "model_service": model_service,
-        "recommendation_service": recommendation_service,
-        "currency_service": currency_service
-    }
+    training_status = services["training_service"].get_status()
+    if training_status["state"] == "running":
+        st.info(f"Training model in the background... {training_status['message']}")
+    elif training_status["state"] == "completed" and st.session_state.get("model_info") != training_status["model_info"]:
+        model_info = training_status["model_info"]
+        st.success(f"Model trained successfully! {model_info['model_type']} (R²: {model_info['r2']:.4f})")
+        st.session_state["model_info"] = model_info
+    elif training_status["state"] in ("failed", "rejected") and st.session_state.get("training_error") != training_status["error"]:
+        st.error(f"Error training model: {training_status['error']}")
+        st.session_state["training_error"] = training_status["error"]
+
+    st.session_state["model_trained"] = services["model_service"].model is not None
+
+    return services
 
 
 def run_app():
@@ -105,9 +91,9 @@ def run_app():
 
     services = initialize_services()
 
-    df = services["dataset_loader"].load_data()
+    df = services["dataset_loader"].df
 
-    selected_page, currency = render_sidebar(services["currency_service"])
+    selected_page, currency = render_sidebar(services["currency_service"], services["training_service"])
     st.session_state.current_currency = currency
 
     selected_page = st.session_state.app_state["page"]
@@ -130,8 +116,13 @@ def run_app():
                     if len(st.session_state.comparison_laptops) > 1:
                         st.info("Go to 'Compare Laptops' to view comparison.")
 
-                if action == "predict":
+                if action == "predict" and not st.session_state["model_trained"]:
+                    st.warning("The price model is still being trained. Please try again in a moment.")
+
+                elif action == "predict":
                     price_prediction = services["model_service"].predict_price(laptop_spec)
+                    catalog_price = price_prediction.predicted_price
+                    conversion_rate = 1.0
 
                     if st.session_state.current_currency != "USD":
                         conversion_rate = services["currency_service"].convert_currency(
@@ -143,7 +134,9 @@ def run_app():
 
                     st.session_state.current_prediction = {
                         "laptop_spec": laptop_spec,
-                        "price_prediction": price_prediction
+                        "price_prediction": price_prediction,
+                        "catalog_price": catalog_price,
+                        "conversion_rate": conversion_rate
                     }
 
                     st.session_state.app_state["showing_prediction"] = True
@@ -151,13 +144,21 @@ def run_app():
 
                     save_to_history(laptop_spec, price_prediction)
 
-                    recommendations = services["recommendation_service"].get_similar_laptops(laptop_spec)
-                    st.session_state.app_state["recommendations"] = recommendations
-
                     render_prediction_results(price_prediction)
 
                     st.markdown("---")
-                    render_recommendations(recommendations, price_prediction.currency)
+                    render_recommendations(services["recommendation_service"], laptop_spec, price_prediction.currency,
+                                           catalog_price, conversion_rate)
+
+            elif st.session_state.app_state["showing_prediction"]:
+                current_prediction = st.session_state.current_prediction
+                render_prediction_results(current_prediction["price_prediction"])
+
+                st.markdown("---")
+                render_recommendations(services["recommendation_service"], current_prediction["laptop_spec"],
+                                       current_prediction["price_prediction"].currency,
+                                       current_prediction.get("catalog_price"),
+                                       current_prediction.get("conversion_rate", 1.0))
         
         with col2:
             render_history()